@@ -0,0 +1,46 @@
+"""Compares the unblocked and blocked LU decomposition of numa.LinearSystem for growing matrix sizes.
+
+Run with
+
+    python benchmarks/benchmark_LU.py
+
+The first column lists the matrix size, the following columns the best of three runs in seconds for every
+panel width. The crossover point is the first size where a blocked run is at least MARGIN (10 percent) faster
+than the unblocked one, so timing noise is not reported as a crossover.
+"""
+import time
+import numpy as np
+from numa.LinearSystem._LU import _factorLU
+
+
+SIZES = [100, 200, 400, 800, 1600]
+BLOCK_SIZES = [None, 32, 64, 128]
+MARGIN = 0.1
+
+
+def best_time(A, block_size, repeats=3):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        _factorLU(A, block_size=block_size)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    np.random.seed(0)
+    header = ["n"] + ["unblocked" if b is None else f"b={b}" for b in BLOCK_SIZES]
+    print("".join(f"{h:>12}" for h in header))
+    crossover = None
+    for n in SIZES:
+        A = np.random.rand(n, n)
+        times = [best_time(A, b) for b in BLOCK_SIZES]
+        print(f"{n:>12}" + "".join(f"{t:>12.4f}" for t in times))
+        if crossover is None and min(times[1:]) < (1 - MARGIN) * times[0]:
+            crossover = n
+    print(f"Blocked decomposition is at least {MARGIN:.0%} faster from n = {crossover} on." if crossover else
+          f"Blocked decomposition was not {MARGIN:.0%} faster for the tested sizes.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,13 @@
 import numpy as np
 from numa import utils
+from ._triangular import solveLower, solveUpper
+from ._refinement import _refine
+from . import _parallel
 
 
-def solveLU(A, b):
-    """Solves the given linear system of equations using LU decomposition. A post-iteration is implemented as well
-to reduce the error.
+def solveLU(A, b, tol=None, max_iterations=10, mixed_precision=False, cache=None):
+    """Solves the given linear system of equations using LU decomposition. An iterative refinement is implemented as
+well to reduce the error.
 
 
 Parameters
@@ -12,89 +15,382 @@ Parameters
 A: numpy.arrays
     Coefficient matrix 
 b: numpy.array
-    Column vector of constant terms
+    Column vector of constant terms or n x k matrix whose columns are right-hand sides
+tol: float, optional
+    Backward error at which the refinement stops. Default set to the machine precision.
+max_iterations: int
+    Maximum number of refinement steps. Default set to 10
+mixed_precision: boolean, optional
+    Information whether A should be decomposed in single precision. Residuals and corrections are still computed
+    in double precision. Default set to False.
+cache: FactorizationCache, optional
+    Cache the decomposition of A is taken from or stored in, so that repeated calls with the same A skip the
+    decomposition. mixed_precision is ignored in that case. Default set to None (no caching).
 
 Returns
 -------
 x: numpy.array
-    Solution vector
+    Solution vector (or matrix) with the same shape as b
+
+Notes
+-----
+The refinement computes the residual of the current solution and solves for a correction with the existing
+decomposition
+
+.. math::
+
+    L \\cdot U \\cdot \\Delta x = P \\cdot (b - A \\cdot x_0)
+
+.. math::
+
+    x_1 = x_0 + \\Delta x
+
+until the normwise backward error is below tol, stops decreasing or max_iterations is reached.
+
+A is treated as singular if one of the pivots is not larger than the relative tolerance
+
+.. math::
+
+    n \\cdot \\epsilon \\cdot min(max_k|a_{ik}|, max_k|a_{kj}|)
+
+with the machine precision of the decomposition, where i and j are the row and column of A the pivot was taken
+from. A pivot only counts as zero if it is negligible compared to both its row and its column, so the test does
+not depend on how the rows or columns of A are scaled. No determinant has to be calculated for that.
+
+In mixed precision the decomposition needs half the memory and time while the refinement recovers double
+precision accuracy for matrices that are not too badly conditioned. If it does not converge, A is decomposed
+again in double precision.
 
 """
     utils._checkDimensions(A, b)
-    if utils.isSingular(A):
+    if cache is not None:
+        factorization = cache.get(A)
+        x_calculated, _ = _refine(A, b, factorization.solve(b), factorization.solve,
+                                  tol=tol, max_iterations=max_iterations)
+        return x_calculated
+
+    row_max, column_max = _scales(A)
+    if mixed_precision:
+        packed, perm = _factorLU(A, dtype=np.float32)
+        if not np.any(_singularPivots(packed, np.minimum(row_max[perm], column_max))):
+            x_calculated, converged = _refine(A, b, _luSolve(packed, perm, b), lambda r: _luSolve(packed, perm, r),
+                                              tol=tol, max_iterations=max_iterations)
+            if converged:
+                return x_calculated
+
+    packed, perm = _factorLU(A)
+    if np.any(_singularPivots(packed, np.minimum(row_max[perm], column_max))):
         raise utils.SingularityError("Input matrix is singular.")
-    L, U = LU(A)
-    x_calculated = _solveX(L, U, b)
-
-    acc = 10e-14
-    accuracy_achieved = False
-    while not accuracy_achieved:
-        delb = b - np.matmul(A, x_calculated)
-        delX = _solveX(L, U, delb)
-        x_calculated = np.subtract(x_calculated, delX)
-        if [x < acc for x in x_calculated]:
-            accuracy_achieved = True
+    x_calculated, _ = _refine(A, b, _luSolve(packed, perm, b), lambda r: _luSolve(packed, perm, r),
+                              tol=tol, max_iterations=max_iterations)
     return x_calculated
 
 
-def _solveX(L, U, b):
-    """Use forward and backwards substitution to calculate the x vector to solve the linear system of equations.
+class LUFactorization:
+    """LU decomposition with partial pivoting of a coefficient matrix that is computed once and reused for any
+number of right-hand sides. Every solve only needs forward and backwards substitution.
 
 
 Parameters
 ----------
-L: numpy.arrays
-    Lower triangular matrix
-U: numpy.arrays
-    Upper triangular matrix
-b: numpy.array
-    Column vector of constant terms
+A: numpy.arrays
+    Coefficient matrix
+block_size: int, optional
+    Width of the column panels if the blocked decomposition should be used. Default set to None (unblocked).
+keep_a: boolean, optional
+    Information whether a copy of A should be kept, which is needed for update. Default set to False.
+
+Attributes
+----------
+LU: numpy.arrays
+    Packed factors, L below the diagonal (unit diagonal not stored) and U on and above it
+perm: numpy.array
+    Row permutation such that A[perm] = L U
+A: numpy.arrays
+    Copy of the (updated) coefficient matrix if keep_a is True, otherwise None
+refactorizations: int
+    Number of updates after which A had to be decomposed again
+
+Raises
+------
+DimensionError
+    If A is not quadratic.
+SingularityError
+    If a pivot is negligible compared to both its row and its column in A, see solveLU.
+
+"""
+
+    def __init__(self, A, block_size=None, keep_a=False):
+        m, n = A.shape
+        if not m == n:
+            raise utils.DimensionError("Input matrix A is not quadratic!")
+        self.n = n
+        self.block_size = block_size
+        self.A = np.array(A, dtype=float) if keep_a else None
+        self.refactorizations = 0
+        self.norm = np.linalg.norm(A, 1)
+        self.LU, self.perm = self._factorize(A)
+
+    def _factorize(self, A):
+        packed, perm = _factorLU(A, block_size=self.block_size)
+        if np.any(_singularPivots(packed, _pivotScale(A, perm))):
+            raise utils.SingularityError("Input matrix is singular.")
+        return packed, perm
+
+    def solve(self, b, trans=False):
+        """Solves A x = b (or A^T x = b) for a column vector b (or a matrix whose columns are right-hand sides)."""
+        b = np.asarray(b, dtype=float)
+        if not b.shape[0] == self.n:
+            raise utils.DimensionError("Dimensions of A and b do not match!")
+        return _luSolve(self.LU, self.perm, b, trans=trans)
+
+    def solve_many(self, B):
+        """Solves A X = B for every column of the n x k matrix B."""
+        B = np.asarray(B, dtype=float)
+        if not B.ndim == 2:
+            raise utils.DimensionError("B has to be a matrix of right-hand sides!")
+        return self.solve(B)
+
+    def det(self):
+        """Returns the determinant of A from the diagonal of U and the sign of the permutation."""
+        sign, logdet = self.slogdet()
+        return sign * np.exp(logdet)
+
+    def slogdet(self):
+        """Returns the sign and the natural logarithm of the absolute value of the determinant of A."""
+        return _luSlogdet(self.LU, self.perm)
+
+    def cond_estimate(self):
+        """Returns an estimate of the condition number of A in the 1-norm using Hager's method."""
+        return self.norm * _inverseNormEstimate(self.solve, lambda x: self.solve(x, trans=True), self.n)
+
+    def update(self, u, v, growth_limit=1e3):
+        """Updates the factorization to A + u v^T in O(n^2) with Bennett's algorithm. Bennett's algorithm does not
+pivot, so A + u v^T is decomposed again if a new pivot is negligible (see solveLU) or an entry of L
+grows beyond growth_limit, which raises a SingularityError if it is singular. The factorization is unchanged in that
+case. Needs keep_a=True."""
+        if self.A is None:
+            raise ValueError("The factorization has to be created with keep_a=True to be updated.")
+        u, v = np.asarray(u, dtype=float).reshape(-1), np.array(v, dtype=float).reshape(-1)
+        if not len(u) == len(v) == self.n:
+            raise utils.DimensionError("Dimensions of A and the update vectors do not match!")
+        A = self.A + np.outer(u, v)
+        packed, perm = self.LU.copy(), self.perm
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            _bennettUpdate(packed, u[perm], v)
+        if (not np.all(np.isfinite(packed)) or np.max(np.abs(np.tril(packed, -1)), initial=0.) > growth_limit
+                or np.any(_singularPivots(packed, _pivotScale(A, perm)))):
+            packed, perm = self._factorize(A)
+            self.refactorizations += 1
+        self.A, self.LU, self.perm = A, packed, perm
+        self.norm = np.linalg.norm(A, 1)
+
+
+def _bennettUpdate(LU, x, y):
+    """Overwrites the packed factors of L U with those of L U + x y^T without pivoting. x and y are overwritten."""
+    for j in range(LU.shape[0]):
+        pivot = LU[j, j]
+        LU[j, j] += x[j] * y[j]
+        LU[j, j+1:] += x[j] * y[j+1:]
+        l = LU[j+1:, j].copy()
+        LU[j+1:, j] = (l * pivot + x[j+1:] * y[j]) / LU[j, j]
+        x[j+1:] -= x[j] * l
+        y[j+1:] -= y[j] / LU[j, j] * LU[j, j+1:]
+    return LU
+
+
+def _luSolve(LU, perm, B, trans=False):
+    """Solves A X = B (or A^T X = B) with the packed factors of A[perm] = L U.
+
+
+Parameters
+----------
+LU: numpy.arrays
+    Packed LU factors
+perm: numpy.array
+    Row permutation of the factorization
+B: numpy.array
+    Column vector or matrix of constant terms
+trans: boolean, optional
+    Information whether the transposed system should be solved. Default set to False.
 
 Returns
 -------
-x: numpy.array
-    Solution vector
+X: numpy.array
+    Solution with the same shape as B
 
 """
-    m, n = L.shape
-    # Forward Substitution
-    y = list()
-    y.insert(0, b[0]/L[0][0])
-    for i in range(1, m):
-        summ = 0
-        for k in range(0, i):
-            summ += L[i][k]*y[k]
-        y.insert(i, (b[i]-summ)/(L[i][i]))
-
-    # Backwards Substitution
-    x = [0]*m
-    x[m-1] = y[m-1] / U[m-1][m-1]
-    for i in range(m - 2, -1, -1):
-        summ = 0
-        for k in range(i+1, n):
-            summ += U[i][k]*x[k]
-        x[i] = (y[i] - summ)/U[i][i]
-
-    return x
-
-
-def LU(A):
+    if not trans:
+        X = np.asarray(B, dtype=float)[perm]
+        return _luSubstitute(LU, X)
+
+    Y = solveUpper(LU, B, trans=True)
+    Y = solveLower(LU, Y, unit_diagonal=True, trans=True, overwrite_b=True)
+    X = np.empty_like(Y)
+    X[perm] = Y
+    return X
+
+
+def _luSubstitute(LU, X):
+    """Forward and backwards substitution with the packed factors, overwriting the already permuted
+right-hand sides X with the solution. Many right-hand sides are solved in column tiles that run in parallel.
+Every tile is copied into a contiguous buffer first, since the substitution is much slower on strided columns."""
+    if X.ndim == 2 and X.shape[1] > _parallel.TILE_SIZE:
+        def substitute(tile):
+            X[:, tile] = _luSubstitute(LU, np.ascontiguousarray(X[:, tile]))
+        _parallel._forEach(substitute, _parallel._tiles(X.shape[1]))
+        return X
+    Y = solveLower(LU, X, unit_diagonal=True, overwrite_b=True)
+    Y = solveUpper(LU, Y, overwrite_b=True)
+    if Y is not X:
+        X[...] = Y
+    return X
+
+
+def _singularPivots(packed, scale):
+    """Returns a boolean mask of the pivots that are zero relative to the given scale of the decomposed matrix.
+
+
+Parameters
+----------
+packed: numpy.arrays
+    Packed LU factors
+scale: float or numpy.array
+    Largest absolute entry of the decomposed matrix, or the scale of every pivot as returned by _pivotScale
+
+Returns
+-------
+mask: numpy.array
+    True for every pivot with |u_ii| <= n * eps * scale
+
+"""
+    n = min(packed.shape)
+    eps = np.finfo(packed.dtype).eps
+    return np.abs(np.diag(packed)) <= n * eps * scale
+
+
+def _scales(A, chunk_bytes=2**20):
+    """Returns the largest absolute entry of every row and of every column of A. The rows are processed in chunks,
+so no temporary of the size of A is allocated."""
+    A = np.asarray(A)
+    rows = max(1, chunk_bytes // (A.itemsize * max(A.shape[1], 1)))
+    row_max, column_max = np.empty(A.shape[0]), np.zeros(A.shape[1])
+    for start in range(0, A.shape[0], rows):
+        chunk = np.abs(A[start:start+rows])
+        row_max[start:start+rows] = np.max(chunk, axis=1, initial=0.)
+        np.maximum(column_max, np.max(chunk, axis=0, initial=0.), out=column_max)
+    return row_max, column_max
+
+
+def _pivotScale(A, perm):
+    """Returns the scale every pivot of A[perm] = L U is compared with, i.e. the smaller of the largest absolute
+entries of the row and of the column of A it was taken from."""
+    row_max, column_max = _scales(A)
+    return np.minimum(row_max[perm], column_max)
+
+
+def _luSlogdet(packed, perm):
+    """Returns (sign, log|det|) of the decomposed matrix. A zero pivot gives (0, -inf)."""
+    pivots = np.diag(packed)
+    if np.any(pivots == 0):
+        return 0., -np.inf
+    sign = _permutationSign(perm) * np.prod(np.sign(pivots))
+    return float(sign), float(np.sum(np.log(np.abs(pivots))))
+
+
+def _permutationSign(perm):
+    """Returns the sign (+1 or -1) of the permutation given as index vector."""
+    visited = np.zeros(len(perm), dtype=bool)
+    sign = 1
+    for start in range(len(perm)):
+        if visited[start]:
+            continue
+        length = 0
+        i = start
+        while not visited[i]:
+            visited[i] = True
+            i = perm[i]
+            length += 1
+        if length % 2 == 0:
+            sign = -sign
+    return sign
+
+
+def _inverseNormEstimate(solve, solveT, n, max_iterations=5):
+    """Estimates the 1-norm of the inverse of A from a few solves with A and its transpose (Hager's method
+with Higham's additional test vector).
+
+
+Parameters
+----------
+solve: callable
+    Returns the solution of A x = b
+solveT: callable
+    Returns the solution of A^T x = b
+n: int
+    Dimension of A
+max_iterations: int
+    Maximum number of iterations. Default set to 5
+
+Returns
+-------
+estimate: float
+    Lower bound for the 1-norm of the inverse which is exact in most cases
+
+References
+-------
+ [1] N. J. Higham, FORTRAN codes for estimating the one-norm of a real or complex matrix, with applications to
+     condition estimation, ACM Trans. Math. Softw. 14 (1988)
+"""
+    x = np.full(n, 1. / n)
+    estimate = 0.
+    for iteration in range(max_iterations):
+        y = solve(x)
+        new_estimate = np.sum(np.abs(y))
+        if iteration > 0 and new_estimate <= estimate:
+            break
+        estimate = new_estimate
+        z = solveT(np.where(y >= 0, 1., -1.))
+        j = np.argmax(np.abs(z))
+        if iteration > 0 and np.abs(z[j]) <= np.dot(z, x):
+            break
+        x = np.zeros(n)
+        x[j] = 1.
+
+    if n > 1:
+        alternating = (-1.) ** np.arange(n) * (1. + np.arange(n) / (n - 1))
+        estimate = max(estimate, 2. * np.sum(np.abs(solve(alternating))) / (3. * n))
+    return estimate
+
+
+def LU(A, pivoting=False, block_size=None):
     """Decompose the given coefficient matrix into a lower and upper triangular matrix L and U so that
 
 .. math::
 
-    A = L \cdot U
+    A = L \\cdot U
+
+or, if partial pivoting is used,
+
+.. math::
+
+    P \\cdot A = L \\cdot U
 
 
 Parameters
 ----------
 A: numpy.arrays
     Matrix
+pivoting: boolean, optional
+    Information whether partial (row) pivoting should be used. If set, the permutation matrix P is returned as well.
+    Default set to False.
+block_size: int, optional
+    Width of the column panels if the blocked decomposition should be used. Default set to None (unblocked).
 
 Returns
 -------
-L, U: numpy.arrays
-    Lower and upper triangular matrix.
+tuple
+    (L, U) or (P, L, U) if pivoting is used.
 
 Notes
 -----
@@ -102,29 +398,121 @@ The decomposition is calculated using Doolittle's method.
 
 .. math::     l_{ii} = 1
 
-.. math::     u_{ij} = a_{ij} - \sum_{k=1}^{i-1}l_{ik}u_{kj}
+.. math::     u_{ij} = a_{ij} - \\sum_{k=1}^{i-1}l_{ik}u_{kj}
+
+.. math::     l_{ji} = u_{ii}^{-1}(a_{ij} - \\sum_{k=1}^{i-1}l_{jk}u_{ki})
+
+The sums are not evaluated element by element. After the k-th column of L and row of U are known,
+the remaining submatrix is updated at once with the outer product
+
+.. math::
+
+    A_{k+1:, k+1:} = A_{k+1:, k+1:} - l_{k+1:, k} \\cdot u_{k, k+1:}
+
+For larger matrices the blocked variant moves most of the work into matrix products which keeps the data
+in cache. A panel of b columns is factorized as above, then
+
+.. math::
+
+    U_{12} = L_{11}^{-1} A_{12}
+
+.. math::
 
-.. math::     l_{ji} = u_{ii}^{-1}(a_{ij} - \sum_{k=1}^{i-1}l_{jk}u_{ki})
+    A_{22} = A_{22} - L_{21} \\cdot U_{12}
 
 """
     m, n = A.shape
-    L, U = np.zeros([m, n]), np.zeros([m, n])
-    for i in range(n):
-        L[i][i] = 1
-
-    for i in range(n):
-
-        # Upper triangular matrix
-        for j in range(i, n):
-            summ = 0
-            for k in range(0, i):
-                summ += L[i][k]*U[k][j]
-            U[i][j] = A[i][j] - summ
-
-        # Lower triangular matrix
-        for j in range(i+1, n):
-            summ = 0
-            for k in range(0, i):
-                summ += L[j][k]*U[k][i]
-            L[j][i] = (A[j][i] - summ)/U[i][i]
-    return L, U
+    packed, perm = _factorLU(A, pivoting=pivoting, block_size=block_size)
+    L = np.tril(packed, -1) + np.identity(n)
+    U = np.triu(packed)
+    if not pivoting:
+        return L, U
+    P = np.identity(n)[perm]
+    return P, L, U
+
+
+def _factorLU(A, pivoting=True, overwrite_a=False, block_size=None, dtype=float):
+    """LU decomposition storing L (without its unit diagonal) and U in a single array.
+
+
+Parameters
+----------
+A: numpy.arrays
+    Matrix with at least as many rows as columns
+pivoting: boolean, optional
+    Information whether partial (row) pivoting should be used. Default set to True.
+overwrite_a: boolean, optional
+    Information whether A may be overwritten with the factors. Default set to False.
+block_size: int, optional
+    Width of the column panels for the blocked decomposition. Default set to None (unblocked).
+dtype: data-type, optional
+    Floating point type the decomposition is computed in. Default set to float.
+
+Returns
+-------
+tuple
+    (packed LU, permutation vector) with A[perm] = L U
+
+"""
+    if overwrite_a and isinstance(A, np.ndarray) and A.dtype == dtype:
+        M = A
+    else:
+        M = np.array(A, dtype=dtype)
+    if block_size is None or block_size >= min(M.shape):
+        perm = _unblockedLU(M, pivoting)
+    else:
+        perm = _blockedLU(M, pivoting, block_size)
+    return M, perm
+
+
+def _unblockedLU(M, pivoting, chunk_bytes=2**20):
+    """Right-looking elimination overwriting M with its packed LU factors. Returns the permutation vector. The
+rank-1 update of the trailing submatrix is done in chunks of rows, so no temporary of the size of M is allocated."""
+    m, n = M.shape
+    perm = np.arange(m)
+    rows = max(1, chunk_bytes // (M.itemsize * n))
+    for k in range(min(m, n)):
+        if pivoting:
+            p = k + np.argmax(np.abs(M[k:, k]))
+            if p != k:
+                M[[k, p]] = M[[p, k]]
+                perm[[k, p]] = perm[[p, k]]
+        pivot = M[k, k]
+        if pivot == 0:
+            if not pivoting and np.any(M[k+1:, k]):
+                raise utils.MethodStuckError(
+                    "Zero pivot encountered. Use pivoting=True.")
+            continue
+        M[k+1:, k] /= pivot
+        for start in range(k + 1, m, rows):
+            M[start:start+rows, k+1:] -= np.outer(M[start:start+rows, k], M[k, k+1:])
+    return perm
+
+
+def _blockedLU(M, pivoting, block_size):
+    """Blocked right-looking elimination overwriting M with its packed LU factors. Returns the permutation vector.
+
+Every panel of block_size columns is factorized with the unblocked method. The row block right of it is then
+solved with the unit lower triangular diagonal block and the trailing submatrix is updated with a matrix
+product. Both are done for independent column tiles, which run in parallel if setNumThreads was called.
+
+"""
+    m, n = M.shape
+    perm = np.arange(m)
+    for k in range(0, min(m, n), block_size):
+        e = min(k + block_size, n)
+        p = _unblockedLU(M[k:, k:e], pivoting)
+        if pivoting:
+            M[k:, :k] = M[k:, :k][p]
+            M[k:, e:] = M[k:, e:][p]
+            perm[k:] = perm[k:][p]
+
+        _parallel._forEach(lambda tile: _updateTile(M, k, e, tile), _parallel._tiles(n - e))
+    return perm
+
+
+def _updateTile(M, k, e, tile):
+    """Solves the columns e + tile right of the panel k:e and updates the trailing submatrix below them."""
+    columns = slice(e + tile.start, e + tile.stop)
+    M[k:e, columns] = solveLower(M[k:e, k:e], M[k:e, columns], unit_diagonal=True, overwrite_b=True)
+    M[e:, columns] -= np.matmul(M[e:, k:e], M[k:e, columns])
@@ -0,0 +1,265 @@
+import numpy as np
+from numa import utils
+from ._triangular import solveUpper
+
+
+def QR(A, block_size=None):
+    """Decompose the given matrix with at least as many rows as columns into a matrix Q with orthonormal columns
+and an upper triangular matrix R so that A = Q R using Householder reflections.
+
+
+Parameters
+----------
+A: numpy.arrays
+    m x n matrix with m >= n
+block_size: int, optional
+    Width of the column panels if the blocked decomposition should be used. Default set to None (unblocked).
+
+Returns
+-------
+tuple
+    (m x n matrix Q, n x n matrix R)
+
+Raises
+------
+DimensionError
+    If A has less rows than columns.
+
+Notes
+-----
+Every column j is reflected onto a multiple of the unit vector with
+
+.. math::
+
+    H_j = I - \\tau_j \\cdot v_j \\cdot v_j^T
+
+so that H_n ... H_1 A = R. In the blocked decomposition the reflections of a panel are collected in the
+compact WY representation
+
+.. math::
+
+    H_k \\cdots H_e = I - V \\cdot T \\cdot V^T
+
+with an upper triangular T, so the trailing columns are updated with three matrix products instead of one
+rank-1 update per reflection.
+
+"""
+    m, n = np.shape(A)
+    if m < n:
+        raise utils.DimensionError("Input matrix A has less rows than columns!")
+    packed, tau = _factorQR(A, block_size=block_size)
+    Q = np.zeros((m, n))
+    Q[np.arange(n), np.arange(n)] = 1.
+    for j in range(n - 1, -1, -1):
+        _reflect(packed[j:, j], tau[j], Q[j:, j:])
+    return Q, np.triu(packed[:n])
+
+
+def solveLeastSquares(A, b, block_size=None):
+    """Solves the overdetermined linear system of equations A x = b in the least squares sense, i.e. x minimizes
+||A x - b||_2, using the QR decomposition of A.
+
+
+Parameters
+----------
+A: numpy.arrays
+    m x n matrix with m >= n and full rank
+b: numpy.array
+    Vector of m constant terms or m x k matrix whose columns are right-hand sides
+block_size: int, optional
+    Width of the column panels if the blocked decomposition should be used. Default set to None (unblocked).
+
+Returns
+-------
+x: numpy.array
+    Solution vector of length n (or n x k matrix)
+
+Raises
+------
+DimensionError
+    If A has less rows than columns or the dimensions of A and b do not match.
+SingularityError
+    If A does not have full rank.
+
+Notes
+-----
+With A = Q R the solution follows from the triangular system
+
+.. math::
+
+    R \\cdot x = Q^T \\cdot b
+
+which avoids the squared condition number of the normal equations.
+
+"""
+    _checkLeastSquares(A, b)
+    packed, tau = _factorQR(A, block_size=block_size)
+    c = _applyQT(packed, tau, np.array(b, dtype=float))
+    n = packed.shape[1]
+    return _solveR(packed[:n], c[:n], np.max(np.abs(A)), len(b))
+
+
+class StreamingLeastSquares:
+    """Least squares solver for tall systems whose rows arrive in chunks, e.g. from an iterator over a file. Only
+the n x n factor R and Q^T b are kept, so the memory does not depend on the number of rows.
+
+
+Parameters
+----------
+n: int
+    Number of unknowns
+
+Attributes
+----------
+rows: int
+    Number of rows consumed so far
+residual: float or numpy.array
+    Sum of squares of the least squares residual ||A x - b||_2^2 (for every right-hand side)
+
+Notes
+-----
+For every chunk the stacked matrix
+
+.. math::
+
+    \\begin{pmatrix} R \\\\ A_i \\end{pmatrix}
+
+is decomposed with Householder reflections, which are applied to the stacked right-hand sides as well. The
+first n rows give the new R and Q^T b, the squares of the remaining rows add up to the residual.
+
+"""
+
+    def __init__(self, n):
+        self.n = n
+        self.rows = 0
+        self.residual = 0.
+        self.R = np.zeros((n, n))
+        self.c = None
+        self._A_max = 0.
+
+    def update(self, A, b):
+        """Adds the rows of the chunk A with the constant terms b."""
+        A = np.asarray(A, dtype=float)
+        b = np.asarray(b, dtype=float)
+        if not A.ndim == 2 or not A.shape[1] == self.n or not len(b) == len(A):
+            raise utils.DimensionError("Dimensions of the chunk do not match!")
+        if self.c is None:
+            self.c = np.zeros((self.n,) + b.shape[1:])
+        packed, tau = _factorQR(np.concatenate((self.R, A)), overwrite_a=True)
+        c = _applyQT(packed, tau, np.concatenate((self.c, b)))
+        self.R = np.triu(packed[:self.n])
+        self.c = c[:self.n]
+        self.residual = self.residual + np.sum(c[self.n:] ** 2, axis=0)
+        self.rows += len(A)
+        self._A_max = max(self._A_max, np.max(np.abs(A), initial=0.))
+
+    def extend(self, chunks):
+        """Adds all (A, b) chunks of an iterable."""
+        for A, b in chunks:
+            self.update(A, b)
+
+    def solve(self):
+        """Returns the least squares solution of all rows consumed so far."""
+        if self.rows < self.n:
+            raise utils.DimensionError("Less rows than unknowns have been consumed!")
+        return _solveR(self.R, self.c, self._A_max, self.rows)
+
+
+def _checkLeastSquares(A, b):
+    m, n = np.shape(A)
+    if m < n:
+        raise utils.DimensionError("Input matrix A has less rows than columns!")
+    if not np.ndim(b) in (1, 2) or not len(b) == m:
+        raise utils.DimensionError("Dimensions of A and b do not match!")
+
+
+def _solveR(R, c, A_max, m):
+    """Solves R x = c and raises a SingularityError if A does not have full rank."""
+    if np.any(np.abs(np.diag(R)) <= m * np.finfo(float).eps * A_max):
+        raise utils.SingularityError("Input matrix does not have full rank.")
+    return solveUpper(R, c, overwrite_b=True)
+
+
+def _factorQR(A, block_size=None, overwrite_a=False):
+    """Householder QR decomposition storing the Householder vectors (without their leading 1) below the diagonal
+and R on and above it.
+
+
+Parameters
+----------
+A: numpy.arrays
+    Matrix with at least as many rows as columns
+block_size: int, optional
+    Width of the column panels for the blocked decomposition. Default set to None (unblocked).
+overwrite_a: boolean, optional
+    Information whether A may be overwritten with the factors. Default set to False.
+
+Returns
+-------
+tuple
+    (packed QR, scalar factors tau of the reflections)
+
+"""
+    if overwrite_a and isinstance(A, np.ndarray) and A.dtype == float:
+        M = A
+    else:
+        M = np.array(A, dtype=float)
+    n = M.shape[1]
+    if block_size is None or block_size >= n:
+        return M, _householderPanel(M)
+
+    tau = np.empty(n)
+    for k in range(0, n, block_size):
+        e = min(k + block_size, n)
+        tau[k:e] = _householderPanel(M[k:, k:e])
+        if e < n:
+            V = np.tril(M[k:, k:e], -1)
+            V[np.arange(e - k), np.arange(e - k)] = 1.
+            T = _triangularFactor(V, tau[k:e])
+            M[k:, e:] -= np.matmul(V, np.matmul(T.T, np.matmul(V.T, M[k:, e:])))
+    return M, tau
+
+
+def _householderPanel(M):
+    """Unblocked Householder QR overwriting M with its packed factors. Returns the scalar factors tau."""
+    m, n = M.shape
+    tau = np.zeros(n)
+    for j in range(min(m, n)):
+        alpha = M[j, j]
+        below = np.linalg.norm(M[j+1:, j])
+        if below == 0:                          # nothing to eliminate, H_j = I
+            continue
+        beta = -np.copysign(np.hypot(alpha, below), alpha)
+        tau[j] = (beta - alpha) / beta
+        M[j+1:, j] /= alpha - beta
+        _reflect(M[j:, j], tau[j], M[j:, j+1:])
+        M[j, j] = beta
+    return tau
+
+
+def _reflect(v, tau, B):
+    """Applies H = I - tau v v^T to B in place. The first entry of v is taken as 1."""
+    if tau == 0:
+        return B
+    w = np.dot(v[1:], B[1:]) + B[0]
+    B[0] -= tau * w
+    B[1:] -= tau * np.outer(v[1:], w) if B.ndim == 2 else tau * v[1:] * w
+    return B
+
+
+def _triangularFactor(V, tau):
+    """Returns the upper triangular T with H_1 ... H_k = I - V T V^T."""
+    k = len(tau)
+    T = np.zeros((k, k))
+    for i in range(k):
+        T[i, i] = tau[i]
+        if i > 0:
+            T[:i, i] = -tau[i] * np.matmul(T[:i, :i], np.matmul(V[:, :i].T, V[:, i]))
+    return T
+
+
+def _applyQT(packed, tau, B):
+    """Applies Q^T = H_n ... H_1 to B in place."""
+    for j in range(packed.shape[1]):
+        _reflect(packed[j:, j], tau[j], B[j:])
+    return B
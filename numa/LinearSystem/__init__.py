@@ -1,10 +1,25 @@
 from ._gauss import solveGauss
-from ._LU import LU, solveLU
+from ._batched import solveBatched
+from ._triangular import solveLower, solveUpper
+from ._LU import LU, LUFactorization, solveLU
+from ._cholesky import CholeskyFactorization, LDL, LDLFactorization, cholesky, solveCholesky
+from ._sparse import CSRMatrix, SparseLUFactorization, reverseCuthillMcKee, solveSparse
+from ._krylov import bicgstab, conjugateGradient, gmres, ilu0Preconditioner, jacobiPreconditioner
+from ._stationary import gaussSeidel, jacobi, sor
+from ._banded import solveBanded, solveTridiagonal
+from ._condition import conditionEstimate
+from ._solve import solve
+from ._outofcore import outOfCoreLU, solveOutOfCore
+from ._parallel import getNumThreads, setNumThreads
+from ._cache import FactorizationCache
+from ._woodbury import solveWoodbury
+from ._QR import QR, StreamingLeastSquares, solveLeastSquares
+from ._eigen import extremeEigenvalues, inverseIteration, powerIteration, singularValues
 from numa import utils
 import numpy as np
 
 
-def condition(A, p):
+def condition(A, p, exact=True, factorization=None):
     """Calculate the condition number of the input Matrix using the numpy function.
 
 
@@ -14,6 +29,12 @@ A: numpy.arrays
     Input matrix whose condition number is sought 
 p: {None, 1, -1, 2, -2, inf, -inf, 'fro'}
     Order of the norm
+exact: boolean, optional
+    Information whether the exact condition number should be calculated. For p = 1 and p = 2 the estimate of
+    conditionEstimate is returned otherwise, which costs O(n^2) instead of an inversion or a singular value
+    decomposition. Default set to True.
+factorization: object, optional
+    Existing factorization of A that is reused by the estimate. Default set to None.
 
 Returns
 -------
@@ -21,4 +42,8 @@ c: float
     Condition number of the matrix. May be infinite.
 
 """
-    return np.linalg.cond(A, p=p)
+    if exact:
+        return np.linalg.cond(A, p=p)
+    if p in (1, 2):
+        return conditionEstimate(A, factorization=factorization, p=p)
+    raise ValueError(f"The condition number can not be estimated for p = {p}.")
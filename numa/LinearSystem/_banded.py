@@ -0,0 +1,130 @@
+import numpy as np
+from numa import utils
+
+
+def solveTridiagonal(ab, b):
+    """Solves the given tridiagonal linear system of equations using the Thomas algorithm in O(n) operations.
+
+
+Parameters
+----------
+ab: numpy.arrays
+    Coefficient matrix in band storage of shape (3, n), or a stack of those of shape (..., 3, n). ab[0, 1:] holds
+    the superdiagonal, ab[1] the diagonal and ab[2, :-1] the subdiagonal, i.e. ab[1 + i - j, j] = a_ij.
+b: numpy.array
+    Column vector of constant terms or n x k matrix whose columns are right-hand sides, with the same leading
+    stack dimensions as ab
+
+Returns
+-------
+x: numpy.array
+    Solution vector (or matrix) with the same shape as b
+
+Notes
+-----
+The Thomas algorithm is Gaussian elimination without pivoting. It is stable for diagonally dominant and for
+symmetric positive definite matrices; use solveBanded for other tridiagonal matrices.
+
+.. math::
+
+    c'_i = \\frac{c_i}{d_i - a_i c'_{i-1}}, \\quad b'_i = \\frac{b_i - a_i b'_{i-1}}{d_i - a_i c'_{i-1}}, \\quad
+    x_i = b'_i - c'_i x_{i+1}
+
+"""
+    ab, X, shape = _prepare(ab, b, 1, 1)
+    batch, _, n = ab.shape
+    upper, diagonal, lower = ab[:, 0, 1:], ab[:, 1], ab[:, 2, :-1]
+    zero_pivot = n * np.finfo(float).eps * np.max(np.abs(ab), axis=(1, 2))
+
+    c = np.empty((batch, n))
+    denominator = diagonal[:, 0]
+    for i in range(n):
+        if i > 0:
+            denominator = diagonal[:, i] - lower[:, i-1] * c[:, i-1]
+            X[:, i] -= lower[:, i-1, None] * X[:, i-1]
+        if np.any(np.abs(denominator) <= zero_pivot):
+            raise utils.SingularityError("Zero pivot in the Thomas algorithm.")
+        if i < n - 1:
+            c[:, i] = upper[:, i] / denominator
+        X[:, i] /= denominator[:, None]
+    for i in range(n - 2, -1, -1):
+        X[:, i] -= c[:, i, None] * X[:, i+1]
+    return X.reshape(shape)
+
+
+def solveBanded(l_and_u, ab, b):
+    """Solves the given banded linear system of equations using LU decomposition with partial pivoting. Work and
+memory are proportional to n times the bandwidth instead of n^3 and n^2.
+
+
+Parameters
+----------
+l_and_u: tuple
+    (kl, ku), the number of nonzero subdiagonals and superdiagonals
+ab: numpy.arrays
+    Coefficient matrix in LAPACK band storage of shape (kl + ku + 1, n), or a stack of those of shape
+    (..., kl + ku + 1, n), with ab[ku + i - j, j] = a_ij
+b: numpy.array
+    Column vector of constant terms or n x k matrix whose columns are right-hand sides, with the same leading
+    stack dimensions as ab
+
+Returns
+-------
+x: numpy.array
+    Solution vector (or matrix) with the same shape as b
+
+Notes
+-----
+Row interchanges can widen the upper band of U to kl + ku, so the factors are stored in kl additional rows as
+in LAPACK's dgbsv. The elimination runs for all matrices of a stack at once.
+
+"""
+    kl, ku = l_and_u
+    ab, X, shape = _prepare(ab, b, kl, ku)
+    batch, _, n = ab.shape
+    kv = kl + ku
+    AB = np.zeros((batch, 2 * kl + ku + 1, n))
+    AB[:, kl:] = ab
+    zero_pivot = n * np.finfo(float).eps * np.max(np.abs(ab), axis=(1, 2))
+    members = np.arange(batch)[:, None]
+
+    for j in range(n):
+        km = min(kl, n - 1 - j)
+        last = min(n - 1, j + kv)
+        p = j + np.argmax(np.abs(AB[:, kv:kv+km+1, j]), axis=1)
+        cols = np.arange(j, last + 1)
+        rows_j, rows_p = kv + j - cols, kv + p[:, None] - cols
+        row = AB[:, rows_j, cols].copy()
+        AB[:, rows_j, cols] = AB[members, rows_p, cols]
+        AB[members, rows_p, cols] = row                             # Swap
+        row = X[:, j].copy()
+        X[:, j] = X[members[:, 0], p]
+        X[members[:, 0], p] = row
+
+        pivot = AB[:, kv, j]
+        if np.any(np.abs(pivot) <= zero_pivot):
+            raise utils.SingularityError("Input matrix is singular.")
+        if km == 0:
+            continue
+        f = AB[:, kv+1:kv+km+1, j] / pivot[:, None]
+        cols = cols[1:]
+        AB[:, kv + np.arange(j + 1, j + km + 1)[:, None] - cols, cols] -= f[:, :, None] * AB[:, None, kv + j - cols, cols]
+        X[:, j+1:j+km+1] -= f[:, :, None] * X[:, None, j]
+
+    for i in range(n - 1, -1, -1):
+        cols = np.arange(i + 1, min(n, i + kv + 1))
+        X[:, i] = (X[:, i] - np.matmul(AB[:, None, kv + i - cols, cols], X[:, cols])[:, 0]) / AB[:, kv, i, None]
+    return X.reshape(shape)
+
+
+def _prepare(ab, b, kl, ku):
+    """Brings ab into the shape (stack, kl + ku + 1, n) and b into (stack, n, k)."""
+    ab = np.asarray(ab, dtype=float)
+    b = np.asarray(b, dtype=float)
+    if ab.ndim < 2 or not ab.shape[-2] == kl + ku + 1:
+        raise utils.DimensionError(f"Band storage needs {kl + ku + 1} rows!")
+    stack, n = ab.shape[:-2], ab.shape[-1]
+    if not b.shape[:len(stack)] == stack or not b.ndim - len(stack) in (1, 2) or not b.shape[len(stack)] == n:
+        raise utils.DimensionError("Dimensions of A and b do not match!")
+    X = np.array(b.reshape((int(np.prod(stack)), n, -1)))
+    return ab.reshape((-1, kl + ku + 1, n)), X, b.shape
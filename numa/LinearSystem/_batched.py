@@ -0,0 +1,94 @@
+import numpy as np
+from numa import utils
+from . import _parallel
+
+CHUNK_SIZE = 64
+
+
+def solveBatched(A, b, tol=None):
+    """Solves a stack of independent linear systems of equations of the same size using the Gauss method. The
+elimination runs for all systems at once, so the cost per system is a small fraction of a single call to
+solveGauss. Singular members do not raise an error but are reported in a mask.
+
+
+Parameters
+----------
+A: numpy.arrays
+    Coefficient matrices of shape (batch, n, n)
+b: numpy.arrays
+    Constant terms of shape (batch, n) or (batch, n, k)
+tol: float, optional
+    Relative tolerance below which a pivot is treated as zero. Default set to n times the machine precision.
+
+Returns
+-------
+tuple
+    (solutions with the same shape as b, boolean mask of singular systems)
+
+Notes
+-----
+The pivot element for the i-th row in the i-th column is chosen for every system through
+
+.. math::
+
+    a_p = max_{k=i,...,n}|a_{ki}|
+
+A system is marked singular if
+
+.. math::
+
+    |a_p| \\le tol \\cdot max_{k,l}|a_{kl}|
+
+and its solution is set to NaN.
+
+If setNumThreads was called with more than one thread, the batch is eliminated in chunks of CHUNK_SIZE members
+that run in parallel. A single thread eliminates the whole batch at once. Every member is eliminated
+independently, so the chunking does not change the results.
+
+"""
+    A = np.array(A, dtype=float)
+    X = np.array(b, dtype=float)
+    if not A.ndim == 3 or not A.shape[1] == A.shape[2]:
+        raise utils.DimensionError("A has to be a stack of quadratic matrices!")
+    if not X.ndim in (2, 3) or not X.shape[:2] == A.shape[:2]:
+        raise utils.DimensionError("Dimensions of A and b do not match!")
+    vector = X.ndim == 2
+    if vector:
+        X = X[:, :, None]
+
+    batch, n, _ = A.shape
+    if tol is None:
+        tol = n * np.finfo(float).eps
+    singular = np.zeros(batch, dtype=bool)
+    chunk_size = CHUNK_SIZE if _parallel.getNumThreads() > 1 else max(batch, 1)
+    _parallel._forEach(lambda chunk: _eliminate(A[chunk], X[chunk], tol, singular[chunk]),
+                       _parallel._tiles(batch, chunk_size))
+    X[singular] = np.nan
+    if vector:
+        X = X[:, :, 0]
+    return X, singular
+
+
+def _eliminate(A, X, tol, singular):
+    """Gauss elimination with partial pivoting for a chunk of the batch, overwriting X with the solutions and
+marking the singular members in the given mask."""
+    batch, n, _ = A.shape
+    threshold = tol * np.max(np.abs(A), axis=(1, 2))
+    members = np.arange(batch)
+
+    for k in range(n):
+        p = k + np.argmax(np.abs(A[:, k:, k]), axis=1)
+        A_row, X_row = A[:, k].copy(), X[:, k].copy()
+        A[:, k], X[:, k] = A[members, p], X[members, p]
+        A[members, p], X[members, p] = A_row, X_row                 # Swap
+
+        pivot = A[:, k, k]
+        zero = np.abs(pivot) <= threshold
+        singular |= zero
+        A[zero, k, k] = 1.
+        f = A[:, k+1:, k] / A[:, k, None, k]
+        A[:, k+1:, k+1:] -= f[:, :, None] * A[:, None, k, k+1:]
+        X[:, k+1:] -= f[:, :, None] * X[:, None, k]
+
+    for i in range(n - 1, -1, -1):
+        X[:, i] = (X[:, i] - np.matmul(A[:, None, i, i+1:], X[:, i+1:])[:, 0]) / A[:, i, None, i]
@@ -0,0 +1,98 @@
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+from ._LU import LUFactorization
+
+
+class FactorizationCache:
+    """Least recently used cache of factorizations, so that repeated solves with the same coefficient matrix only
+need the O(n^2) substitutions instead of a new O(n^3) decomposition.
+
+
+Parameters
+----------
+max_bytes: int, optional
+    Memory the cached factorizations may use together. Default set to 256 MiB.
+factorization: class, optional
+    Factorization that is computed for a matrix, e.g. LUFactorization or CholeskyFactorization. Default set to
+    LUFactorization.
+
+Attributes
+----------
+hits: int
+    Number of lookups that found a cached factorization
+misses: int
+    Number of lookups that had to decompose the matrix
+nbytes: int
+    Memory used by the cached factorizations
+
+Notes
+-----
+A matrix is identified by a BLAKE2 hash of its content, shape and data type, which costs O(n^2). Alternatively a
+key can be given, which has to change whenever the matrix does. If storing a factorization exceeds max_bytes,
+the least recently used ones are evicted. Factorizations larger than max_bytes are not stored at all.
+
+"""
+
+    def __init__(self, max_bytes=2**28, factorization=LUFactorization):
+        self.max_bytes = max_bytes
+        self.factorization = factorization
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, A, key=None):
+        """Returns the factorization of A, decomposing it only if it is not cached yet."""
+        if key is None:
+            key = _contentHash(A)
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key][0]
+            self.misses += 1
+
+        factorization = self.factorization(A)
+        size = _nbytes(factorization)
+        with self._lock:
+            if size <= self.max_bytes and key not in self._entries:
+                self._entries[key] = (factorization, size)
+                self.nbytes += size
+                while self.nbytes > self.max_bytes:
+                    _, (_, evicted) = self._entries.popitem(last=False)
+                    self.nbytes -= evicted
+        return factorization
+
+    def solve(self, A, b, key=None):
+        """Solves A x = b with the cached factorization of A."""
+        return self.get(A, key=key).solve(b)
+
+    def clear(self):
+        """Removes all cached factorizations and resets the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+
+def _contentHash(A):
+    """Returns a hash of the content, shape and data type of A."""
+    A = np.ascontiguousarray(A)
+    digest = hashlib.blake2b(A.view(np.uint8).reshape(-1), digest_size=16)
+    digest.update(str((A.shape, A.dtype.str)).encode())
+    return digest.hexdigest()
+
+
+def _nbytes(factorization):
+    """Returns the memory used by the arrays of a factorization."""
+    return sum(value.nbytes for value in vars(factorization).values() if isinstance(value, np.ndarray))
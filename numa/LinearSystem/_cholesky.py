@@ -0,0 +1,394 @@
+import numpy as np
+from numa import utils
+from ._triangular import solveLower
+from ._LU import _inverseNormEstimate
+
+
+def cholesky(A):
+    """Decompose the given symmetric positive definite matrix into a lower triangular matrix L so that
+
+.. math::
+
+    A = L \\cdot L^T
+
+
+Parameters
+----------
+A: numpy.arrays
+    Symmetric positive definite matrix. Only its lower triangle is used.
+
+Returns
+-------
+L: numpy.arrays
+    Lower triangular matrix
+
+Raises
+------
+PositiveDefiniteError
+    If A is not positive definite. This is detected during the decomposition, so a successful call is the
+    cheapest check for positive definiteness.
+
+Notes
+-----
+The columns of L are computed one after the other, each with a single matrix-vector product
+
+.. math::     l_{kk} = \\sqrt{a_{kk} - \\sum_{j=1}^{k-1}l_{kj}^2}
+
+.. math::     l_{ik} = l_{kk}^{-1}(a_{ik} - \\sum_{j=1}^{k-1}l_{ij}l_{kj})
+
+This needs half the work and memory of the LU decomposition.
+
+"""
+    m, n = A.shape
+    if not m == n:
+        raise utils.DimensionError("Input matrix A is not quadratic!")
+    L = np.tril(np.array(A, dtype=float))
+    for k in range(n):
+        L[k:, k] -= np.dot(L[k:, :k], L[k, :k])
+        if not L[k, k] > 0:
+            raise utils.PositiveDefiniteError("Input matrix is not positive definite.")
+        L[k, k] = np.sqrt(L[k, k])
+        L[k+1:, k] /= L[k, k]
+    return L
+
+
+def LDL(A, pivoting=True):
+    """Decompose the given symmetric matrix into a unit lower triangular matrix L and a block diagonal matrix D so
+that
+
+.. math::
+
+    P \\cdot A \\cdot P^T = L \\cdot D \\cdot L^T
+
+with the symmetric pivoting of Bunch and Kaufman, or A = L D L^T with a diagonal D without pivoting.
+
+
+Parameters
+----------
+A: numpy.arrays
+    Symmetric matrix, which may be indefinite. Only its lower triangle is used.
+pivoting: boolean, optional
+    Information whether Bunch-Kaufman pivoting should be used. If set, the permutation matrix P is returned as
+    well. Default set to True.
+
+Returns
+-------
+tuple
+    (L, D) or (P, L, D) if pivoting is used. With pivoting D has 1 x 1 and 2 x 2 blocks on its diagonal.
+
+Raises
+------
+SingularityError
+    If A is singular, i.e. a whole pivot column is not larger than n * eps * max|a_ij|. Without pivoting this
+    already happens if a pivot d_k is that small, e.g. for nonsingular matrices with zeros on the diagonal.
+
+Notes
+-----
+Without pivoting
+
+.. math::     d_k = a_{kk} - \\sum_{j=1}^{k-1}l_{kj}^2 d_j
+
+.. math::     l_{ik} = d_k^{-1}(a_{ik} - \\sum_{j=1}^{k-1}l_{ij}l_{kj}d_j)
+
+which is only stable for quasi-definite matrices. With pivoting, lambda is the largest entry below the diagonal
+of the current column k, found in row r, and sigma the largest off-diagonal entry of row r. With
+alpha = (1 + sqrt(17)) / 8 the pivot is
+
+- a_kk as 1 x 1 block if |a_kk| >= alpha lambda or |a_kk| sigma >= alpha lambda^2
+- a_rr as 1 x 1 block if |a_rr| >= alpha sigma
+- the 2 x 2 block of rows and columns k and r otherwise
+
+which bounds the entries of L and the growth of the trailing matrix like partial pivoting does for LU.
+
+References
+-------
+ [1] J. R. Bunch, L. Kaufman, Some stable methods for calculating inertia and solving symmetric linear systems,
+     Math. Comp. 31 (1977)
+"""
+    W, d, e, perm = _factorLDL(A, pivoting=pivoting)
+    n = len(d)
+    L, D = np.tril(W, -1) + np.identity(n), np.diag(d) + np.diag(e, 1) + np.diag(e, -1)
+    if not pivoting:
+        return L, D
+    return np.identity(n)[perm], L, D
+
+
+def _factorLDL(A, pivoting=True):
+    """LDL^T decomposition returning L below the diagonal of the first array, the diagonal and subdiagonal of the
+block diagonal D and the permutation with A[perm][:, perm] = L D L^T."""
+    m, n = A.shape
+    if not m == n:
+        raise utils.DimensionError("Input matrix A is not quadratic!")
+    A = np.array(A, dtype=float)
+    zero_pivot = n * np.finfo(float).eps * np.max(np.abs(np.tril(A)), initial=0.)
+    if pivoting:
+        return _bunchKaufman(np.tril(A) + np.tril(A, -1).T, zero_pivot)
+
+    W = np.tril(A)
+    d = np.zeros(n)
+    for k in range(n):
+        v = W[k, :k] * d[:k]
+        d[k] = W[k, k] - np.dot(W[k, :k], v)
+        if abs(d[k]) <= zero_pivot:
+            raise utils.SingularityError("Input matrix is singular.")
+        W[k+1:, k] = (W[k+1:, k] - np.dot(W[k+1:, :k], v)) / d[k]
+    return W, d, np.zeros(max(n - 1, 0)), np.arange(n)
+
+
+def _bunchKaufman(W, zero_pivot):
+    """Right-looking LDL^T decomposition with Bunch-Kaufman pivoting overwriting the symmetric matrix W."""
+    n = len(W)
+    alpha = (1 + np.sqrt(17)) / 8
+    d, e, perm = np.zeros(n), np.zeros(max(n - 1, 0)), np.arange(n)
+    k = 0
+    while k < n:
+        a_kk = abs(W[k, k])
+        r = k + 1 + np.argmax(np.abs(W[k+1:, k])) if k + 1 < n else k
+        lam = abs(W[r, k]) if r > k else 0.
+        if max(a_kk, lam) <= zero_pivot:
+            raise utils.SingularityError("Input matrix is singular.")
+
+        size, swap = 1, k
+        if a_kk < alpha * lam:
+            row = np.abs(W[r, k:])
+            row[r - k] = 0.
+            sigma = np.max(row)
+            if a_kk * sigma >= alpha * lam ** 2:
+                pass
+            elif abs(W[r, r]) >= alpha * sigma:
+                swap = r
+            else:
+                size, swap = 2, r
+        target = k + size - 1
+        if not swap == target:
+            W[[target, swap]] = W[[swap, target]]
+            W[k:, [target, swap]] = W[k:, [swap, target]]
+            perm[[target, swap]] = perm[[swap, target]]
+
+        if size == 1:
+            d[k] = W[k, k]
+            column = W[k+1:, k].copy()
+            W[k+1:, k] /= d[k]
+            W[k+1:, k+1:] -= np.outer(W[k+1:, k], column)
+        else:
+            d[k], d[k+1], e[k] = W[k, k], W[k+1, k+1], W[k+1, k]
+            det = d[k] * d[k+1] - e[k] ** 2
+            C = W[k+2:, k:k+2].copy()
+            W[k+2:, k] = (C[:, 0] * d[k+1] - C[:, 1] * e[k]) / det
+            W[k+2:, k+1] = (C[:, 1] * d[k] - C[:, 0] * e[k]) / det
+            W[k+1, k] = 0.
+            W[k+2:, k+2:] -= np.matmul(W[k+2:, k:k+2], C.T)
+        k += size
+    return np.tril(W), d, e, perm
+
+
+def solveCholesky(A, b):
+    """Solves the given linear system of equations with a symmetric positive definite coefficient matrix using the
+Cholesky decomposition.
+
+
+Parameters
+----------
+A: numpy.arrays
+    Symmetric positive definite coefficient matrix
+b: numpy.array
+    Column vector of constant terms or n x k matrix whose columns are right-hand sides
+
+Returns
+-------
+x: numpy.array
+    Solution vector (or matrix) with the same shape as b
+
+"""
+    utils._checkDimensions(A, b)
+    return CholeskyFactorization(A).solve(b)
+
+
+class CholeskyFactorization:
+    """Cholesky decomposition A = L L^T of a symmetric positive definite matrix that is computed once and reused
+for any number of right-hand sides.
+
+
+Parameters
+----------
+A: numpy.arrays
+    Symmetric positive definite matrix. Only its lower triangle is used.
+keep_a: boolean, optional
+    Information whether a copy of A should be kept, which is needed for update and downdate. Default set to False.
+
+Attributes
+----------
+L: numpy.arrays
+    Lower triangular factor
+A: numpy.arrays
+    Copy of the (updated) matrix if keep_a is True, otherwise None
+refactorizations: int
+    Number of downdates after which A had to be decomposed again
+
+Raises
+------
+PositiveDefiniteError
+    If A is not positive definite.
+
+"""
+
+    def __init__(self, A, keep_a=False):
+        self.n = A.shape[0]
+        self.norm = np.linalg.norm(A, 1)
+        self.L = cholesky(A)
+        self.A = np.array(A, dtype=float) if keep_a else None
+        self.refactorizations = 0
+
+    def solve(self, b, trans=False):
+        """Solves A x = b for a column vector b (or a matrix whose columns are right-hand sides). A is symmetric, so
+trans has no effect."""
+        y = solveLower(self.L, b)
+        return solveLower(self.L, y, trans=True, overwrite_b=True)
+
+    def solve_many(self, B):
+        """Solves A X = B for every column of the n x k matrix B."""
+        if not np.ndim(B) == 2:
+            raise utils.DimensionError("B has to be a matrix of right-hand sides!")
+        return self.solve(B)
+
+    def det(self):
+        """Returns the determinant of A."""
+        return np.exp(self.slogdet()[1])
+
+    def slogdet(self):
+        """Returns the sign and the natural logarithm of the absolute value of the determinant of A."""
+        return 1., float(2. * np.sum(np.log(np.diag(self.L))))
+
+    def cond_estimate(self):
+        """Returns an estimate of the condition number of A in the 1-norm using Hager's method."""
+        return self.norm * _inverseNormEstimate(self.solve, self.solve, self.n)
+
+    def update(self, x):
+        """Updates the factorization to A + x x^T in O(n^2) with Givens rotations. Needs keep_a=True."""
+        self._modify(x, 1.)
+
+    def downdate(self, x):
+        """Updates the factorization to A - x x^T in O(n^2) with hyperbolic rotations. If a new diagonal entry almost
+cancels, A - x x^T is decomposed again, which raises a PositiveDefiniteError if it is not positive definite
+anymore. The factorization is unchanged in that case. Needs keep_a=True."""
+        self._modify(x, -1.)
+
+    def _modify(self, x, sign):
+        if self.A is None:
+            raise ValueError("The factorization has to be created with keep_a=True to be updated.")
+        x = np.array(x, dtype=float).reshape(-1)
+        if not len(x) == self.n:
+            raise utils.DimensionError("Dimensions of A and the update vector do not match!")
+        A = self.A + sign * np.outer(x, x)
+        L = self.L.copy()
+        if not _choleskyUpdate(L, x, sign):
+            L = cholesky(A)
+            self.refactorizations += 1
+        self.A, self.L = A, L
+        self.norm = np.linalg.norm(A, 1)
+
+
+def _choleskyUpdate(L, x, sign):
+    """Overwrites L with the Cholesky factor of L L^T + sign x x^T. x is overwritten. Returns False if a diagonal
+entry is not larger than n * eps times its old value, in which case L is unusable."""
+    n = L.shape[0]
+    eps = np.finfo(float).eps
+    for k in range(n):
+        r2 = L[k, k] ** 2 + sign * x[k] ** 2
+        if r2 <= n * eps * L[k, k] ** 2:
+            return False
+        r = np.sqrt(r2)
+        c, s = r / L[k, k], x[k] / L[k, k]
+        L[k, k] = r
+        L[k+1:, k] = (L[k+1:, k] + sign * s * x[k+1:]) / c
+        x[k+1:] = c * x[k+1:] - s * L[k+1:, k]
+    return True
+
+
+class LDLFactorization:
+    """LDL^T decomposition of a symmetric, possibly indefinite matrix that is computed once and reused for any number
+of right-hand sides.
+
+
+Parameters
+----------
+A: numpy.arrays
+    Symmetric matrix. Only its lower triangle is used.
+
+Attributes
+----------
+L: numpy.arrays
+    Unit lower triangular factor, the diagonal is not stored
+d: numpy.array
+    Diagonal of the block diagonal D
+e: numpy.array
+    Subdiagonal of D, nonzero only within its 2 x 2 blocks
+perm: numpy.array
+    Symmetric permutation such that A[perm][:, perm] = L D L^T
+
+Raises
+------
+SingularityError
+    If A is singular, see LDL.
+
+Notes
+-----
+The decomposition uses Bunch-Kaufman pivoting, see LDL.
+
+"""
+
+    def __init__(self, A):
+        self.n = A.shape[0]
+        self.norm = np.linalg.norm(A, 1)
+        self.L, self.d, self.e, self.perm = _factorLDL(A)
+
+    def solve(self, b, trans=False):
+        """Solves A x = b for a column vector b (or a matrix whose columns are right-hand sides). A is symmetric, so
+trans has no effect."""
+        b = np.asarray(b, dtype=float)
+        if not b.shape[0] == self.n:
+            raise utils.DimensionError("Dimensions of A and b do not match!")
+        y = solveLower(self.L, b[self.perm], unit_diagonal=True, overwrite_b=True)
+        y = _blockDiagonalSolve(self.d, self.e, y)
+        y = solveLower(self.L, y, unit_diagonal=True, trans=True, overwrite_b=True)
+        x = np.empty_like(y)
+        x[self.perm] = y
+        return x
+
+    def solve_many(self, B):
+        """Solves A X = B for every column of the n x k matrix B."""
+        if not np.ndim(B) == 2:
+            raise utils.DimensionError("B has to be a matrix of right-hand sides!")
+        return self.solve(B)
+
+    def det(self):
+        """Returns the determinant of A."""
+        sign, logdet = self.slogdet()
+        return sign * np.exp(logdet)
+
+    def slogdet(self):
+        """Returns the sign and the natural logarithm of the absolute value of the determinant of A."""
+        blocks = self.d.copy()
+        second = np.nonzero(self.e)[0] + 1
+        blocks[second - 1] = self.d[second - 1] * self.d[second] - self.e[second - 1] ** 2
+        blocks = np.delete(blocks, second)
+        return float(np.prod(np.sign(blocks))), float(np.sum(np.log(np.abs(blocks))))
+
+    def cond_estimate(self):
+        """Returns an estimate of the condition number of A in the 1-norm using Hager's method."""
+        return self.norm * _inverseNormEstimate(self.solve, self.solve, self.n)
+
+
+def _blockDiagonalSolve(d, e, Y):
+    """Solves D X = Y in place for the block diagonal D with diagonal d and subdiagonal e."""
+    shape = (-1,) + (1,) * (Y.ndim - 1)
+    first = np.nonzero(e)[0]
+    second = first + 1
+    single = np.ones(len(d), dtype=bool)
+    single[first], single[second] = False, False
+    Y[single] /= d[single].reshape(shape)
+    det = (d[first] * d[second] - e[first] ** 2).reshape(shape)
+    y1, y2 = Y[first].copy(), Y[second].copy()
+    Y[first] = (d[second].reshape(shape) * y1 - e[first].reshape(shape) * y2) / det
+    Y[second] = (d[first].reshape(shape) * y2 - e[first].reshape(shape) * y1) / det
+    return Y
@@ -0,0 +1,60 @@
+import numpy as np
+from numa import utils
+from ._LU import LUFactorization, _inverseNormEstimate
+from ._eigen import _normEstimate2
+
+
+def conditionEstimate(A, factorization=None, p=1):
+    """Estimates the condition number of the input matrix in the 1-norm or 2-norm from an LU, Cholesky or LDL^T
+decomposition. Only a few triangular solves are needed, so the cost is O(n^2) once the decomposition is known.
+
+
+Parameters
+----------
+A: numpy.arrays
+    Input matrix whose condition number is sought
+factorization: object, optional
+    Existing LUFactorization, CholeskyFactorization or LDLFactorization of A that should be reused.
+    Default set to None (A is decomposed with partial pivoting).
+p: {1, 2}, optional
+    Order of the norm. Default set to 1.
+
+Returns
+-------
+c: float
+    Estimate of the condition number. It is a lower bound and exact in most cases.
+
+Notes
+-----
+.. math::
+
+    \\kappa_1(A) = ||A||_1 \\cdot ||A^{-1}||_1
+
+The first factor is computed exactly. The second one is estimated with Hager's method, which maximizes
+||A^{-1} x||_1 over the unit ball of the 1-norm by a gradient ascent through solves with A and A^T.
+
+In the 2-norm both factors are the largest singular values of A and A^{-1}. They are estimated with the power
+iteration on A^T A and A^{-1} A^{-T}, which stops once the estimates change by less than 1e-6 relatively.
+
+References
+-------
+ [1] N. J. Higham, FORTRAN codes for estimating the one-norm of a real or complex matrix, with applications to
+     condition estimation, ACM Trans. Math. Softw. 14 (1988)
+"""
+    m, n = A.shape
+    if not m == n:
+        raise utils.DimensionError("Input matrix A is not quadratic!")
+    if factorization is None:
+        try:
+            factorization = LUFactorization(A)
+        except utils.SingularityError:
+            return np.inf
+    solveT = lambda x: factorization.solve(x, trans=True)
+    if p == 2:
+        A = np.asarray(A)
+        norm = _normEstimate2(lambda x: np.matmul(A, x), lambda x: np.matmul(A.T, x), n)
+        return norm * _normEstimate2(solveT, factorization.solve, n)
+    if not p == 1:
+        raise ValueError(f"The condition number can not be estimated for p = {p}.")
+    inverse_norm = _inverseNormEstimate(factorization.solve, solveT, n)
+    return np.linalg.norm(A, 1) * inverse_norm
@@ -0,0 +1,346 @@
+import numpy as np
+from numa import utils
+from ._LU import LUFactorization
+from ._sparse import CSRMatrix
+from ._krylov import _asMatvec
+
+
+def powerIteration(A, x0=None, tol=1e-10, max_iterations=10000, giveIterations=False):
+    """Calculates the eigenvalue of largest magnitude and its eigenvector with the power iteration. A is only used
+through products with vectors.
+
+
+Parameters
+----------
+A: numpy.arrays, CSRMatrix or callable
+    Quadratic matrix or function returning the product A x
+x0: numpy.array, optional
+    Start vector, needed if A is a function. Default set to a random vector.
+tol: float, optional
+    Relative residual ||A x - lambda x|| / |lambda| at which the iteration stops. Default set to 1e-10.
+max_iterations: int, optional
+    Maximum number of iterations. Default set to 10000.
+giveIterations: boolean, optional
+    Information whether a list of (iteration, residual) should be returned as well. Default set to False.
+
+Returns
+-------
+tuple
+    (eigenvalue, normalized eigenvector)
+
+Raises
+------
+MaximumIterationError
+    If the residual is still larger than tol after max_iterations.
+
+Notes
+-----
+The iteration
+
+.. math::
+
+    x_{k+1} = \\frac{A \\cdot x_k}{||A \\cdot x_k||}
+
+converges linearly with the ratio |lambda_2 / lambda_1| of the two eigenvalues of largest magnitude. The
+eigenvalue is estimated with the Rayleigh quotient. The dominant eigenvalue has to be real and unique.
+
+"""
+    matvec, x = _setupEigen(A, x0)
+    convergence = []
+    y = matvec(x)
+    for n in range(1, max_iterations+1):
+        eigenvalue = np.dot(x, y)
+        residual = np.linalg.norm(y - eigenvalue * x)
+        err = residual / abs(eigenvalue) if eigenvalue != 0 else residual
+        convergence.append((n, err))
+        if err < tol:
+            return _result(eigenvalue, x, convergence, giveIterations)
+        y_norm = np.linalg.norm(y)
+        if y_norm == 0:
+            return _result(0., x, convergence, giveIterations)
+        x = y / y_norm
+        y = matvec(x)
+
+    raise utils.MaximumIterationError(n)
+
+
+def inverseIteration(A, shift=0., x0=None, tol=1e-10, max_iterations=1000, factorization=None,
+                     giveIterations=False):
+    """Calculates the eigenvalue closest to shift and its eigenvector with the inverse iteration. A - shift I is
+decomposed only once, every iteration needs a forward and backwards substitution.
+
+
+Parameters
+----------
+A: numpy.arrays
+    Quadratic matrix
+shift: float, optional
+    Value the sought eigenvalue is closest to. Default set to 0 (eigenvalue of smallest magnitude).
+x0: numpy.array, optional
+    Start vector. Default set to a random vector.
+tol: float, optional
+    Relative residual ||A x - lambda x|| / ||A||_1 at which the iteration stops. Default set to 1e-10.
+max_iterations: int, optional
+    Maximum number of iterations. Default set to 1000.
+factorization: object, optional
+    Existing factorization of A - shift I, e.g. LUFactorization. Default set to None.
+giveIterations: boolean, optional
+    Information whether a list of (iteration, residual) should be returned as well. Default set to False.
+
+Returns
+-------
+tuple
+    (eigenvalue, normalized eigenvector)
+
+Raises
+------
+SingularityError
+    If shift is an eigenvalue of A up to the rounding errors of the decomposition.
+MaximumIterationError
+    If the residual is still larger than tol after max_iterations.
+
+Notes
+-----
+This is the power iteration with
+
+.. math::
+
+    (A - \\sigma I)^{-1}
+
+whose dominant eigenvalue belongs to the eigenvalue of A closest to the shift sigma.
+
+"""
+    A = np.asarray(A, dtype=float)
+    if factorization is None:
+        factorization = LUFactorization(A - shift * np.identity(len(A)))
+    _, x = _setupEigen(A, x0)
+    A_norm = np.linalg.norm(A, 1)
+    convergence = []
+    for n in range(1, max_iterations+1):
+        y = factorization.solve(x)
+        x = y / np.linalg.norm(y)
+        Ax = np.matmul(A, x)
+        eigenvalue = np.dot(x, Ax)
+        err = np.linalg.norm(Ax - eigenvalue * x) / A_norm
+        convergence.append((n, err))
+        if err < tol:
+            return _result(eigenvalue, x, convergence, giveIterations)
+
+    raise utils.MaximumIterationError(n)
+
+
+def extremeEigenvalues(A, n=None, symmetric=True, tol=1e-10, max_iterations=None):
+    """Calculates the extreme eigenvalues of a large matrix with the Lanczos method (symmetric A) or the Arnoldi
+method. A is only used through products with vectors.
+
+
+Parameters
+----------
+A: numpy.arrays, CSRMatrix or callable
+    Quadratic matrix or function returning the product A x
+n: int, optional
+    Dimension of A, needed if A is a function. Default set to None.
+symmetric: boolean, optional
+    Information whether A is symmetric. Default set to True.
+tol: float, optional
+    Relative residual of the extreme Ritz values at which the iteration stops. Default set to 1e-10.
+max_iterations: int, optional
+    Maximum dimension of the Krylov subspace. Default set to min(n, 500).
+
+Returns
+-------
+tuple
+    (smallest, largest) eigenvalue for symmetric A, the (possibly complex) eigenvalues of smallest and largest
+    magnitude otherwise
+
+Raises
+------
+MaximumIterationError
+    If the extreme Ritz values did not converge within max_iterations.
+
+Notes
+-----
+After k steps the orthonormal basis V_k of the Krylov subspace span{x, A x, ..., A^(k-1) x} satisfies
+
+.. math::
+
+    A \\cdot V_k = V_k \\cdot H_k + h_{k+1,k} \\cdot v_{k+1} \\cdot e_k^T
+
+with a tridiagonal (Lanczos) or Hessenberg (Arnoldi) matrix H_k. The eigenvalues of the small matrix H_k (Ritz
+values) approximate the extreme eigenvalues of A, and the residual of a Ritz pair with eigenvector y of H_k is
+|h_{k+1,k} y_k|. The basis is reorthogonalized in every step, which costs O(n k^2) but keeps the Ritz values
+free of spurious copies.
+
+The extreme eigenvalues of a symmetric matrix converge fast. For a nonsymmetric matrix the Ritz values on the
+outside of the spectrum converge first, the one of smallest magnitude can need many steps. Use inverseIteration
+in that case.
+
+"""
+    matvec, n = _operator(A, n)
+    max_iterations = min(n, 500) if max_iterations is None else min(n, max_iterations)
+    V = np.zeros((n, max_iterations + 1))
+    H = np.zeros((max_iterations + 1, max_iterations))
+    V[:, 0] = _startVector(n)
+    for k in range(max_iterations):
+        w = matvec(V[:, k])
+        for _ in range(2):                      # classical Gram-Schmidt, twice is enough
+            h = np.matmul(V[:, :k+1].T, w)
+            w -= np.matmul(V[:, :k+1], h)
+            H[:k+1, k] += h
+        H[k+1, k] = np.linalg.norm(w)
+        if symmetric and k > 1:
+            H[:k-1, k] = 0.
+        breakdown = H[k+1, k] <= np.finfo(float).eps * np.max(np.abs(H[:k+2, :k+1]))
+        if not breakdown:
+            V[:, k+1] = w / H[k+1, k]
+
+        if breakdown or k + 1 == n or (k + 1) % 5 == 0 or k + 1 == max_iterations:
+            values, residuals = _ritz(H[:k+1, :k+1], H[k+1, k], symmetric)
+            order = np.argsort(values.real if symmetric else np.abs(values))
+            scale = np.max(np.abs(values))
+            if breakdown or k + 1 == n or np.all(residuals[order[[0, -1]]] <= tol * scale):
+                return values[order[0]], values[order[-1]]
+
+    raise utils.MaximumIterationError(max_iterations)
+
+
+def singularValues(A, n=None, rmatvec=None, tol=1e-10, max_iterations=None):
+    """Calculates the smallest and largest singular value of a large matrix with the Golub-Kahan-Lanczos
+bidiagonalization. A is only used through products A x and A^T y.
+
+
+Parameters
+----------
+A: numpy.arrays, CSRMatrix or callable
+    m x n matrix with m >= n or function returning the product A x
+n: int, optional
+    Number of columns of A, needed if A is a function. Default set to None.
+rmatvec: callable, optional
+    Function returning the product A^T y, needed if A is a function. Default set to None.
+tol: float, optional
+    Relative residual of the extreme Ritz values at which the iteration stops. Default set to 1e-10.
+max_iterations: int, optional
+    Maximum number of steps. Default set to min(n, 500).
+
+Returns
+-------
+tuple
+    (smallest, largest) singular value
+
+Raises
+------
+MaximumIterationError
+    If the extreme Ritz values did not converge within max_iterations.
+
+Notes
+-----
+The bidiagonalization builds orthonormal bases U_k and V_k with
+
+.. math::
+
+    A \\cdot V_k = U_k \\cdot B_k, \\quad A^T \\cdot U_k = V_k \\cdot B_k^T + \\beta_{k+1} \\cdot v_{k+1} \\cdot e_k^T
+
+and an upper bidiagonal B_k whose singular values approximate those of A. The condition number in the 2-norm is
+the ratio of the two returned values. Like the Lanczos method, the largest singular value converges fast and the
+smallest one can need many steps. For a quadratic matrix that can be decomposed, conditionEstimate with p = 2 is
+cheaper.
+
+"""
+    if callable(A) and not isinstance(A, CSRMatrix):
+        if rmatvec is None or n is None:
+            raise ValueError("rmatvec and n are needed if A is a function.")
+        matvec = A
+    elif isinstance(A, CSRMatrix):
+        matvec, rmatvec, n = A.matvec, A.transpose().matvec, A.shape[1]
+    else:
+        A = np.asarray(A)
+        matvec, rmatvec, n = (lambda x: np.matmul(A, x)), (lambda y: np.matmul(A.T, y)), A.shape[1]
+    max_iterations = min(n, 500) if max_iterations is None else min(n, max_iterations)
+    V = np.zeros((n, max_iterations + 1))
+    U = []
+    alpha, beta = np.zeros(max_iterations), np.zeros(max_iterations + 1)
+    V[:, 0] = _startVector(n)
+    for k in range(max_iterations):
+        u = matvec(V[:, k]) - (beta[k] * U[-1] if U else 0.)
+        for u_previous in U:
+            u -= np.dot(u_previous, u) * u_previous
+        alpha[k] = np.linalg.norm(u)
+        if alpha[k] == 0:                       # A V_(k+1) = U_k C, so A has a null vector
+            C = np.diag(beta[1:k+1], 1)[:k]
+            C[:, :k] += np.diag(alpha[:k])
+            return 0., (np.linalg.norm(C, 2) if k > 0 else 0.)
+        U.append(u / alpha[k])
+
+        v = rmatvec(U[-1]) - alpha[k] * V[:, k]
+        v -= np.matmul(V[:, :k+1], np.matmul(V[:, :k+1].T, v))
+        beta[k+1] = np.linalg.norm(v)
+        breakdown = beta[k+1] <= np.finfo(float).eps * np.max(alpha[:k+1])
+        if not breakdown:
+            V[:, k+1] = v / beta[k+1]
+
+        if breakdown or k + 1 == n or (k + 1) % 5 == 0 or k + 1 == max_iterations:
+            B = np.diag(alpha[:k+1]) + np.diag(beta[1:k+1], 1)
+            P, sigma, _ = np.linalg.svd(B)
+            residuals = beta[k+1] * np.abs(P[-1])
+            if breakdown or k + 1 == n or np.all(residuals[[0, -1]] <= tol * sigma[0]):
+                return sigma[-1], sigma[0]
+
+    raise utils.MaximumIterationError(max_iterations)
+
+
+def _ritz(H, h, symmetric):
+    """Returns the Ritz values of H and the residuals |h y_k| of the Ritz pairs."""
+    if symmetric:
+        values, Y = np.linalg.eigh(H)
+    else:
+        values, Y = np.linalg.eig(H)
+    return values, abs(h) * np.abs(Y[-1])
+
+
+def _normEstimate2(apply, applyT, n, tol=1e-6, max_iterations=100):
+    """Estimates the 2-norm of an operator with the power iteration on its normal operator. The estimate is a
+lower bound that increases monotonically."""
+    x = _startVector(n)
+    estimate = 0.
+    for _ in range(max_iterations):
+        y = applyT(apply(x))
+        y_norm = np.linalg.norm(y)
+        if y_norm == 0:
+            return 0.
+        previous, estimate = estimate, np.sqrt(y_norm)
+        x = y / y_norm
+        if estimate - previous <= tol * estimate:
+            break
+    return estimate
+
+
+def _operator(A, n):
+    if isinstance(A, CSRMatrix) or not callable(A):
+        n = A.shape[0]
+    elif n is None:
+        raise ValueError("n is needed if A is a function.")
+    return _asMatvec(A), n
+
+
+def _setupEigen(A, x0):
+    if x0 is None:
+        if callable(A) and not isinstance(A, CSRMatrix):
+            raise ValueError("x0 is needed if A is a function.")
+        x0 = _startVector(A.shape[0])
+    elif not callable(A) and not np.shape(A) == (len(x0), len(x0)):
+        raise utils.DimensionError("Dimensions of A and x0 do not match!")
+    x = np.array(x0, dtype=float)
+    return _asMatvec(A), x / np.linalg.norm(x)
+
+
+def _startVector(n):
+    """Returns a reproducible random unit vector, which has a component in the direction of every eigenvector
+with probability one."""
+    x = np.random.RandomState(0).rand(n) - 0.5
+    return x / np.linalg.norm(x)
+
+
+def _result(eigenvalue, x, convergence, giveIterations):
+    if not giveIterations:
+        return eigenvalue, x
+    return eigenvalue, x, convergence
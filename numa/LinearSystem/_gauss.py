@@ -1,10 +1,16 @@
 import numpy as np
 from numa import utils
+from ._LU import _luSolve, _scales
+from ._triangular import solveUpper
+from ._refinement import _refine
 
+PIVOTING = ("partial", "scaled", "rook", "complete")
 
-def solveGauss(A, b):
-    """Solves the given linear system of equations using the Gauss method. A post-iteration is implemented as well
-to reduce the error.
+
+def solveGauss(A, b, tol=None, max_iterations=10, overwrite_a=False, overwrite_b=False, out=None,
+               pivoting="partial", giveInfo=False):
+    """Solves the given linear system of equations using the Gauss method. An iterative refinement is implemented as
+well to reduce the error.
 
 
 Parameters
@@ -12,12 +18,27 @@ Parameters
 A: numpy.arrays
     Coefficient matrix 
 b: numpy.array
-    Column vector of constant terms
+    Column vector of constant terms or n x k matrix whose columns are right-hand sides
+tol: float, optional
+    Backward error at which the refinement stops. Default set to the machine precision.
+max_iterations: int
+    Maximum number of refinement steps. Default set to 10
+overwrite_a: boolean, optional
+    Information whether A may be overwritten with the multipliers and the eliminated matrix. Default set to False.
+overwrite_b: boolean, optional
+    Information whether b may be overwritten with the solution. Default set to False.
+out: numpy.array, optional
+    Array of floats with the shape of b the solution is written into. Default set to None.
+pivoting: {'partial', 'scaled', 'rook', 'complete'}, optional
+    Pivoting strategy, see Notes. Default set to 'partial'.
+giveInfo: boolean, optional
+    Information whether a dictionary with the pivoting strategy and the growth factor should be returned as well.
 
 Returns
 -------
-x: numpy.array
-    Solution vector
+x: numpy.array or tuple
+    Solution vector (or matrix) with the same shape as b, or (solution, info) if giveInfo is set. info is a
+    dictionary with the keys 'pivoting' and 'growth_factor'.
 
 Notes
 -----
@@ -27,82 +48,183 @@ The pivot element for the i-th row in the i-th column is choosen through
 
     a_p = max_{k=i,...,n}|a_{ki}|
 
-Rounding errors can lead to less accurate results so
+for partial pivoting. Scaled partial pivoting divides every candidate by the largest absolute entry of its row in
+A, which prevents badly scaled rows from being chosen. Rook pivoting alternates between searching the column and
+the row of the current candidate until it finds an entry that is the largest of both. Complete pivoting chooses
+the largest entry of the whole remaining submatrix. Rook and complete pivoting also interchange columns and are
+the most stable, complete pivoting costs an O(n^2) search for every pivot though.
+
+The growth factor
 
 .. math::
 
-    A \cdot (x + \Delta x) = b + \Delta b
+    \\rho = \\frac{max_{i,j}|u_{ij}|}{max_{i,j}|a_{ij}|}
+
+bounds the backward error of the elimination relative to n \\cdot \\epsilon. It is returned with giveInfo, so
+the cheapest strategy with a small growth factor can be chosen for a class of matrices.
 
-is calculated instead. This can be rewritten 
+A is treated as singular, if a pivot is not larger than
 
 .. math::
 
-    \Delta b = A \cdot (x + \Delta x) - b 
+    n \\cdot \\epsilon \\cdot min(max_l|a_{kl}|, max_l|a_{lj}|)
 
-.. math::
+where k and j are the row and column of A the pivot was taken from. A pivot only counts as zero if it is
+negligible compared to both its row and its column, so rows or columns of very different magnitude are not
+mistaken for zero ones. This is detected during the elimination itself, so no determinant has to be calculated.
 
-    A \cdot \Delta x = \Delta b
+Rounding errors can lead to less accurate results so the residual
 
 .. math::
 
-    x_0 = (x + \Delta x)
+    \\Delta b = b - A \\cdot x_0
+
+is calculated and the correction
 
 .. math::
 
-    x_1 = x_0 - \Delta x
+    A \\cdot \\Delta x = \\Delta b
 
-"""
-    utils._checkDimensions(A, b)
-    if utils.isSingular(A):
-        raise utils.SingularityError("Input matrix is singular.")
-    x_calculated = _gauss(A, b)
+is solved with the multipliers and pivots stored during the elimination, so no second elimination is needed.
 
-    acc = 10e-14
-    accuracy_achieved = False
-    while not accuracy_achieved:
-        delb = b - np.matmul(A, x_calculated)
-        delX = _gauss(A, delb)
-        x_calculated = np.subtract(x_calculated, delX)
-        if [x < acc for x in x_calculated]:
-            accuracy_achieved = True
-    return x_calculated
+.. math::
 
+    x_1 = x_0 + \\Delta x
 
-def _gauss(A, b):
-    """Python implementation of the Gauß method to solve systems of linear equations.
+This is repeated until the normwise backward error is below tol, stops decreasing or max_iterations is reached.
+The refinement needs the original A and b, so it is skipped if one of them is overwritten. Without refinement
+and with overwrite_a, overwrite_b (or out) set, no array of the size of A or b is allocated.
+
+"""
+    utils._checkDimensions(A, b)
+    if out is not None:
+        if not out.shape == np.shape(b):
+            raise utils.DimensionError("Dimensions of b and out do not match!")
+        out[...] = b
+        X = out
+    elif overwrite_b and isinstance(b, np.ndarray) and b.dtype == float:
+        X = b
+    else:
+        X = np.array(b, dtype=float)
+    if overwrite_a and isinstance(A, np.ndarray) and A.dtype == float:
+        M = A
+    else:
+        M = np.array(A, dtype=float)
+
+    if pivoting not in PIVOTING:
+        raise ValueError(f"Unknown pivoting strategy {pivoting}. Choose one of {PIVOTING}.")
+
+    packed, perm, column_perm, growth = _gauss(M, X, pivoting=pivoting)
+    if not (M is A or X is b):
+        X, _ = _refine(A, b, X, lambda r: _unpermute(_luSolve(packed, perm, r), column_perm),
+                       tol=tol, max_iterations=max_iterations)
+    if giveInfo:
+        return X, {"pivoting": pivoting, "growth_factor": growth}
+    return X
+
+
+def _unpermute(Y, column_perm):
+    """Returns the solution X with X[column_perm] = Y."""
+    X = np.empty_like(Y)
+    X[column_perm] = Y
+    return X
+
+
+def _gauss(M, X, chunk_bytes=2**20, pivoting="partial"):
+    """Python implementation of the Gauß method to solve systems of linear equations in place.
 
 
 Parameters
 ----------
-A: numpy.arrays
-    Coefficient matrix 
-b: numpy.array
-    Column vector of constant terms
+M: numpy.arrays
+    Coefficient matrix of floats, overwritten with the multipliers below and the eliminated matrix on and above
+    the diagonal
+X: numpy.array
+    Column vector of constant terms or n x k matrix whose columns are right-hand sides, overwritten with the
+    solution
+chunk_bytes: int, optional
+    Size of the work buffer the rows below the pivot are eliminated in. Default set to 1 MiB.
+pivoting: {'partial', 'scaled', 'rook', 'complete'}, optional
+    Pivoting strategy. Default set to 'partial'.
 
 Returns
 -------
-x: numpy.array
-    Solution vector
+tuple
+    (packed LU factors, row permutation, column permutation, growth factor) so that
+    A[perm][:, column_perm] = L U for the original A
+
+Raises
+------
+SingularityError
+    If a pivot is negligible compared to both its row and its column in A.
 
 """
-    M = np.column_stack((A, b))
-    m, n = M.shape
-    for j in range(n-1):
-        # i - row, j - column
-        pivot_elements = [abs(M[l][j]) for l in range(j, len(M))]
-        pivot_index = pivot_elements.index(max(pivot_elements)) + j
-        pivot_row, j_row = np.copy(M[pivot_index]), np.copy(M[j])
-        M[j], M[pivot_index] = pivot_row, j_row                     # Swap
-
-        for i in range(j+1, m):
-            f = M[i][j] / M[j][j]
-            for k in range(j + 1, n):
-                M[i][k] -= M[j][k] * f
-            M[i][j] = 0
-
-    x = []
-    for i in range(m - 1, -1, -1):
-        x.insert(0, M[i][m] / M[i][i])
-        for k in range(i - 1, -1, -1):
-            M[k][m] -= M[k][i] * x[0]
-    return x
+    m = M.shape[0]
+    perm, column_perm = np.arange(m), np.arange(m)
+    scale, column_scale = _scales(M)
+    if np.any(scale == 0) or np.any(column_scale == 0):
+        raise utils.SingularityError("Input matrix is singular.")
+    A_max = np.max(scale)
+    eps = np.finfo(float).eps
+    rows = max(1, chunk_bytes // (8 * m))
+    work = np.empty((min(rows, m), m))
+    M_row, X_row, M_column = np.empty(m), np.empty(X.shape[1:]), np.empty(m)
+    U_max = 0.
+    for j in range(m):
+        p, q = _pivot(M, j, pivoting, scale[j:] if pivoting == "scaled" else None)
+        if not p == j:                          # Swap rows
+            M_row[:] = M[j]
+            M[j] = M[p]
+            M[p] = M_row
+            X_row[...] = X[j]
+            X[j] = X[p]
+            X[p] = X_row
+            perm[j], perm[p] = perm[p], perm[j]
+            scale[j], scale[p] = scale[p], scale[j]
+        if not q == j:                          # Swap columns
+            M_column[:] = M[:, j]
+            M[:, j] = M[:, q]
+            M[:, q] = M_column
+            column_perm[j], column_perm[q] = column_perm[q], column_perm[j]
+            column_scale[j], column_scale[q] = column_scale[q], column_scale[j]
+        if abs(M[j, j]) <= m * eps * min(scale[j], column_scale[j]):
+            raise utils.SingularityError("Input matrix is singular.")
+        U_max = max(U_max, np.max(np.abs(M[j, j:])))
+
+        M[j+1:, j] /= M[j, j]                   # keep the multipliers for later solves
+        for start in range(j + 1, m, rows):
+            stop = min(start + rows, m)
+            T = work[:stop-start, :m-j-1]
+            np.multiply(M[start:stop, j, None], M[j, j+1:], out=T)
+            M[start:stop, j+1:] -= T
+            if X.ndim == 1:
+                X[start:stop] -= M[start:stop, j] * X[j]
+            else:
+                X[start:stop] -= M[start:stop, j, None] * X[j]
+    solveUpper(M, X, overwrite_b=True)
+    if pivoting in ("rook", "complete"):
+        X[...] = _unpermute(X, column_perm)
+    return M, perm, column_perm, U_max / A_max
+
+
+def _pivot(M, j, pivoting, scale):
+    """Returns the row and column of the pivot for the j-th elimination step."""
+    if pivoting == "partial":
+        return j + np.argmax(np.abs(M[j:, j])), j
+    if pivoting == "scaled":
+        return j + np.argmax(np.abs(M[j:, j]) / scale), j
+    if pivoting == "complete":
+        p, q = np.unravel_index(np.argmax(np.abs(M[j:, j:])), M[j:, j:].shape)
+        return j + p, j + q
+
+    q = j
+    p = j + np.argmax(np.abs(M[j:, q]))
+    while True:
+        column = j + np.argmax(np.abs(M[p, j:]))
+        if not abs(M[p, column]) > abs(M[p, q]):
+            return p, q
+        q = column
+        row = j + np.argmax(np.abs(M[j:, q]))
+        if not abs(M[row, q]) > abs(M[p, q]):
+            return p, q
+        p = row
@@ -0,0 +1,370 @@
+import numpy as np
+from numa import utils
+from ._sparse import CSRMatrix
+from ._triangular import solveUpper
+
+
+def conjugateGradient(A, b, x0=None, tol=1e-10, max_iterations=10000, preconditioner=None, giveIterations=False):
+    """Solves the given linear system of equations with a symmetric positive definite coefficient matrix using the
+(preconditioned) conjugate gradient method. A is only used through products with vectors.
+
+
+Parameters
+----------
+A: numpy.arrays, CSRMatrix or callable
+    Coefficient matrix or function returning the product A x
+b: numpy.array
+    Column vector of constant terms
+x0: numpy.array, optional
+    Initial guess of the solution. Default set to the zero vector.
+tol: float, optional
+    Relative residual ||b - A x|| / ||b|| at which the iteration stops. Default set to 1e-10
+max_iterations: int
+    Maximum number of iterations until the loop breaks. Default set to 10000
+preconditioner: callable, optional
+    Function applying the inverse of a symmetric positive definite preconditioner M to a vector, e.g. from
+    jacobiPreconditioner. Default set to None.
+giveIterations: boolean, optional
+    Information whether the relative residual of every iteration should be returned or not.
+
+Returns
+-------
+tuple
+    (solution vector, relative residual, convergence)
+
+Notes
+-----
+The search directions are A-conjugate, so in exact arithmetic the method terminates after at most n iterations.
+Every iteration needs one product with A and one application of the preconditioner.
+
+.. math::
+
+    \\alpha_k = \\frac{r_k^T z_k}{p_k^T A p_k}, \\quad x_{k+1} = x_k + \\alpha_k p_k, \\quad
+    r_{k+1} = r_k - \\alpha_k A p_k
+
+References
+-------
+ [1] Y. Saad, Iterative Methods for Sparse Linear Systems, 2nd edition, SIAM (2003), Algorithm 9.1
+"""
+    matvec, precondition, x, r, b_norm = _setup(A, b, x0, preconditioner)
+    convergence = list()
+    err = np.linalg.norm(r) / b_norm
+    if err < tol:
+        return _result(x, err, convergence, giveIterations)
+
+    z = precondition(r)
+    p = z.copy()
+    rz = np.dot(r, z)
+    for n in range(1, max_iterations+1):
+        Ap = matvec(p)
+        pAp = np.dot(p, Ap)
+        if pAp <= 0:
+            raise utils.MethodStuckError("Matrix is not positive definite.")
+        alpha = rz / pAp
+        x += alpha * p
+        r -= alpha * Ap
+
+        err = np.linalg.norm(r) / b_norm
+        convergence.append((n, err))
+        if err < tol:
+            return _result(x, err, convergence, giveIterations)
+
+        z = precondition(r)
+        rz_new = np.dot(r, z)
+        p = z + (rz_new / rz) * p
+        rz = rz_new
+
+    raise utils.MaximumIterationError(n)
+
+
+def bicgstab(A, b, x0=None, tol=1e-10, max_iterations=10000, preconditioner=None, giveIterations=False):
+    """Solves the given linear system of equations with a general coefficient matrix using the (right
+preconditioned) biconjugate gradient stabilized method. A is only used through products with vectors.
+
+
+Parameters
+----------
+A: numpy.arrays, CSRMatrix or callable
+    Coefficient matrix or function returning the product A x
+b: numpy.array
+    Column vector of constant terms
+x0: numpy.array, optional
+    Initial guess of the solution. Default set to the zero vector.
+tol: float, optional
+    Relative residual ||b - A x|| / ||b|| at which the iteration stops. Default set to 1e-10
+max_iterations: int
+    Maximum number of iterations until the loop breaks. Default set to 10000
+preconditioner: callable, optional
+    Function applying the inverse of a preconditioner M to a vector, e.g. from ilu0Preconditioner.
+    Default set to None.
+giveIterations: boolean, optional
+    Information whether the relative residual of every iteration should be returned or not.
+
+Returns
+-------
+tuple
+    (solution vector, relative residual, convergence)
+
+Notes
+-----
+Every iteration needs two products with A and two applications of the preconditioner. Unlike GMRES the memory
+needed does not grow with the number of iterations.
+
+References
+-------
+ [1] H. A. van der Vorst, Bi-CGSTAB: A fast and smoothly converging variant of Bi-CG for the solution of
+     nonsymmetric linear systems, SIAM J. Sci. Stat. Comput. 13 (1992)
+"""
+    matvec, precondition, x, r, b_norm = _setup(A, b, x0, preconditioner)
+    convergence = list()
+    err = np.linalg.norm(r) / b_norm
+    if err < tol:
+        return _result(x, err, convergence, giveIterations)
+
+    r_hat = r.copy()
+    rho = alpha = omega = 1.
+    v = p = np.zeros_like(r)
+    for n in range(1, max_iterations+1):
+        rho_new = np.dot(r_hat, r)
+        if rho_new == 0:
+            raise utils.MethodStuckError("Breakdown, r_hat is orthogonal to the residual.")
+        p = r + (rho_new / rho) * (alpha / omega) * (p - omega * v)
+        p_hat = precondition(p)
+        v = matvec(p_hat)
+        alpha = rho_new / np.dot(r_hat, v)
+        s = r - alpha * v
+
+        err = np.linalg.norm(s) / b_norm
+        if err < tol:
+            x += alpha * p_hat
+            convergence.append((n, err))
+            return _result(x, err, convergence, giveIterations)
+
+        s_hat = precondition(s)
+        t = matvec(s_hat)
+        tt = np.dot(t, t)
+        if tt == 0:
+            raise utils.MethodStuckError("Breakdown, A s is zero.")
+        omega = np.dot(t, s) / tt
+        x += alpha * p_hat + omega * s_hat
+        r = s - omega * t
+        rho = rho_new
+
+        err = np.linalg.norm(r) / b_norm
+        convergence.append((n, err))
+        if err < tol:
+            return _result(x, err, convergence, giveIterations)
+        if omega == 0:
+            raise utils.MethodStuckError("Breakdown, omega is zero.")
+
+    raise utils.MaximumIterationError(n)
+
+
+def gmres(A, b, x0=None, tol=1e-10, max_iterations=10000, restart=30, preconditioner=None, giveIterations=False):
+    """Solves the given linear system of equations with a general coefficient matrix using the restarted (right
+preconditioned) generalized minimal residual method. A is only used through products with vectors.
+
+
+Parameters
+----------
+A: numpy.arrays, CSRMatrix or callable
+    Coefficient matrix or function returning the product A x
+b: numpy.array
+    Column vector of constant terms
+x0: numpy.array, optional
+    Initial guess of the solution. Default set to the zero vector.
+tol: float, optional
+    Relative residual ||b - A x|| / ||b|| at which the iteration stops. Default set to 1e-10
+max_iterations: int
+    Maximum total number of inner iterations until the loop breaks. Default set to 10000
+restart: int
+    Number of inner iterations after which the Krylov basis is discarded. Default set to 30
+preconditioner: callable, optional
+    Function applying the inverse of a preconditioner M to a vector, e.g. from ilu0Preconditioner.
+    Default set to None.
+giveIterations: boolean, optional
+    Information whether the relative residual of every iteration should be returned or not.
+
+Returns
+-------
+tuple
+    (solution vector, relative residual, convergence)
+
+Notes
+-----
+An orthonormal basis V of the Krylov space is built with the Arnoldi method and
+
+.. math::
+
+    x = x_0 + M^{-1} V y, \\quad y = argmin_y ||\\beta e_1 - H y||
+
+is chosen, where H is the upper Hessenberg matrix of the Arnoldi method. H is reduced to triangular form with
+Givens rotations while it is built, so the residual norm is known in every iteration without forming x.
+Orthogonalization uses classical Gram-Schmidt applied twice, which vectorizes over the basis.
+
+References
+-------
+ [1] Y. Saad, M. H. Schultz, GMRES: A generalized minimal residual algorithm for solving nonsymmetric linear
+     systems, SIAM J. Sci. Stat. Comput. 7 (1986)
+"""
+    matvec, precondition, x, r, b_norm = _setup(A, b, x0, preconditioner)
+    convergence = list()
+    n = 0
+    while True:
+        beta = np.linalg.norm(r)
+        err = beta / b_norm
+        if err < tol:
+            return _result(x, err, convergence, giveIterations)
+
+        V = np.zeros((restart + 1, len(r)))
+        H = np.zeros((restart + 1, restart))
+        cs, sn = np.zeros(restart), np.zeros(restart)
+        g = np.zeros(restart + 1)
+        g[0] = beta
+        V[0] = r / beta
+        for j in range(restart):
+            n += 1
+            w = matvec(precondition(V[j]))
+            for _ in range(2):
+                h = np.matmul(V[:j+1], w)
+                w -= np.matmul(h, V[:j+1])
+                H[:j+1, j] += h
+            H[j+1, j] = np.linalg.norm(w)
+            if H[j+1, j] > 0:
+                V[j+1] = w / H[j+1, j]
+
+            for i in range(j):                                  # previous rotations
+                H[i, j], H[i+1, j] = cs[i] * H[i, j] + sn[i] * H[i+1, j], -sn[i] * H[i, j] + cs[i] * H[i+1, j]
+            denominator = np.hypot(H[j, j], H[j+1, j])
+            if denominator == 0:
+                raise utils.MethodStuckError("Breakdown, the Hessenberg matrix is singular.")
+            cs[j], sn[j] = H[j, j] / denominator, H[j+1, j] / denominator
+            H[j, j], H[j+1, j] = denominator, 0.
+            g[j], g[j+1] = cs[j] * g[j], -sn[j] * g[j]
+
+            err = abs(g[j+1]) / b_norm
+            convergence.append((n, err))
+            if err < tol or n >= max_iterations:
+                break
+
+        y = solveUpper(H[:j+1, :j+1], g[:j+1])
+        x += precondition(np.matmul(y, V[:j+1]))
+        if err < tol:
+            return _result(x, err, convergence, giveIterations)
+        if n >= max_iterations:
+            raise utils.MaximumIterationError(n)
+        r = b - matvec(x)
+
+
+def jacobiPreconditioner(A):
+    """Returns the Jacobi (diagonal) preconditioner of A.
+
+
+Parameters
+----------
+A: numpy.arrays or CSRMatrix
+    Coefficient matrix
+
+Returns
+-------
+function: callable
+    Function applying the inverse of the diagonal of A to a vector
+
+"""
+    d = A.diagonal() if isinstance(A, CSRMatrix) else np.diag(A).astype(float)
+    if np.any(d == 0):
+        raise utils.SingularityError("Diagonal of A contains a zero.")
+    inverse = 1. / d
+    return lambda r: inverse * r
+
+
+def ilu0Preconditioner(A):
+    """Returns the incomplete LU preconditioner of A without fill-in, ILU(0). L and U have the same sparsity
+pattern as A.
+
+
+Parameters
+----------
+A: numpy.arrays or CSRMatrix
+    Quadratic coefficient matrix
+
+Returns
+-------
+function: callable
+    Function solving L U z = r for a vector r
+
+Notes
+-----
+The entries are computed row by row, dropping every update that would create an entry outside of the pattern
+
+.. math::
+
+    a_{ik} = a_{ik} / a_{kk}, \\quad a_{ij} = a_{ij} - a_{ik} a_{kj} \\quad (k < i, k < j, a_{ij} \\neq 0)
+
+"""
+    if not isinstance(A, CSRMatrix):
+        A = CSRMatrix.fromDense(A)
+    n = A.shape[0]
+    rows = []
+    for i in range(n):
+        start, end = A.indptr[i], A.indptr[i+1]
+        rows.append(dict(zip(A.indices[start:end].tolist(), A.data[start:end].tolist())))
+
+    lower, upper, diagonal = [], [], np.empty(n)
+    for i in range(n):
+        row = rows[i]
+        for k in sorted(j for j in row if j < i):
+            row[k] /= diagonal[k]
+            for j, value in upper[k]:
+                if j in row:
+                    row[j] -= row[k] * value
+        if row.get(i, 0.) == 0:
+            raise utils.SingularityError("Zero pivot in the incomplete LU decomposition.")
+        diagonal[i] = row[i]
+        lower.append([(j, value) for j, value in row.items() if j < i])
+        upper.append([(j, value) for j, value in row.items() if j > i])
+
+    lower = [(np.array([j for j, _ in entries], dtype=int), np.array([v for _, v in entries])) for entries in lower]
+    upper = [(np.array([j for j, _ in entries], dtype=int), np.array([v for _, v in entries])) for entries in upper]
+
+    def precondition(r):
+        z = np.array(r, dtype=float)
+        for i in range(n):
+            cols, values = lower[i]
+            z[i] -= np.dot(values, z[cols])
+        for i in range(n - 1, -1, -1):
+            cols, values = upper[i]
+            z[i] = (z[i] - np.dot(values, z[cols])) / diagonal[i]
+        return z
+    return precondition
+
+
+def _asMatvec(A):
+    """Returns a function computing the product of A with a vector."""
+    if isinstance(A, CSRMatrix):
+        return A.matvec
+    if callable(A):
+        return A
+    A = np.asarray(A)
+    return lambda x: np.matmul(A, x)
+
+
+def _setup(A, b, x0, preconditioner):
+    b = np.asarray(b, dtype=float)
+    if not b.ndim == 1:
+        raise utils.DimensionError("b has to be a column vector!")
+    if not callable(A):
+        if not A.shape == (len(b), len(b)):
+            raise utils.DimensionError("Dimensions of A and b do not match!")
+    matvec = _asMatvec(A)
+    precondition = preconditioner if preconditioner is not None else (lambda r: r)
+    x = np.zeros(len(b)) if x0 is None else np.array(x0, dtype=float)
+    r = b - matvec(x)
+    b_norm = np.linalg.norm(b)
+    return matvec, precondition, x, r, b_norm if b_norm > 0 else 1.
+
+
+def _result(x, err, convergence, giveIterations):
+    if not giveIterations:
+        return x, err
+    return x, err, convergence
@@ -0,0 +1,127 @@
+import numpy as np
+from numa import utils
+from ._LU import _unblockedLU
+from ._triangular import solveLower, solveUpper
+
+
+def outOfCoreLU(A, memory_limit=2**28):
+    """LU decomposition with partial pivoting of a matrix that does not fit into memory, e.g. a numpy.memmap.
+A is overwritten in place with the packed factors, L below the diagonal (unit diagonal not stored) and U on and
+above it. Only tiles of A are held in memory at any time.
+
+
+Parameters
+----------
+A: numpy.memmap or numpy.arrays
+    Quadratic coefficient matrix of floats. It is overwritten with the factors.
+memory_limit: int, optional
+    Number of bytes the tiles held in memory may use. Default set to 256 MiB.
+
+Returns
+-------
+perm: numpy.array
+    Row permutation such that A[perm] = L U for the original A
+
+Raises
+------
+DimensionError
+    If A is not quadratic.
+SingularityError
+    If a pivot is negligible compared to both its row and its column in A, see solveLU. A is partially
+    overwritten in that case.
+
+Notes
+-----
+The decomposition is left-looking: the columns are processed in panels of width
+
+.. math::
+
+    w = \\frac{memory\\_limit}{3 \\cdot itemsize \\cdot n}
+
+so that a panel, a tile of the already factorized columns and the update product fit into the budget. Each
+panel is read once, updated with all tiles left of it, factorized in memory and written back. The row
+interchanges of a panel are then applied tile by tile to the columns left of it. The columns right of it are
+not touched until their panel is read, so the file is never held in memory as a whole.
+
+For a C-ordered file every tile read touches n segments of w numbers, so w should be a few hundred at least to
+read whole pages. A Fortran-ordered memmap streams the panels contiguously.
+
+"""
+    m, n = A.shape
+    if not m == n:
+        raise utils.DimensionError("Input matrix A is not quadratic!")
+    if not np.issubdtype(A.dtype, np.floating):
+        raise ValueError("A has to be a floating point array that can hold the factors.")
+    w = _panelWidth(n, memory_limit, 3 * A.itemsize)
+
+    row_max, column_max = np.empty(n), np.zeros(n)
+    for k in range(0, n, w):
+        tile = np.abs(A[k:k+w])
+        row_max[k:k+w] = np.max(tile, axis=1)
+        np.maximum(column_max, np.max(tile, axis=0), out=column_max)
+    eps = np.finfo(A.dtype).eps
+
+    perm = np.arange(n)
+    for k in range(0, n, w):
+        e = min(k + w, n)
+        panel = np.asarray(A[perm, k:e])
+        for c in range(0, k, w):
+            d = min(c + w, k)
+            tile = np.array(A[c:, c:d])
+            panel[c:d] = solveLower(tile[:d-c], panel[c:d], unit_diagonal=True, overwrite_b=True)
+            panel[d:] -= np.matmul(tile[d-c:], panel[c:d])
+
+        p = _unblockedLU(panel[k:], True)
+        perm[k:] = perm[k:][p]
+        if np.any(np.abs(np.diag(panel[k:e])) <= n * eps * np.minimum(row_max[perm[k:e]], column_max[k:e])):
+            raise utils.SingularityError("Input matrix is singular.")
+        A[:, k:e] = panel
+        for c in range(0, k, w):
+            d = min(c + w, k)
+            A[k:, c:d] = A[k:, c:d][p]
+    if isinstance(A, np.memmap):
+        A.flush()
+    return perm
+
+
+def solveOutOfCore(LU, perm, b, memory_limit=2**28):
+    """Solves A x = b with the packed factors computed by outOfCoreLU. LU is read in blocks of rows.
+
+
+Parameters
+----------
+LU: numpy.memmap or numpy.arrays
+    Packed LU factors
+perm: numpy.array
+    Row permutation of the factorization
+b: numpy.array
+    Column vector of constant terms or n x k matrix whose columns are right-hand sides
+memory_limit: int, optional
+    Number of bytes the row blocks held in memory may use. Default set to 256 MiB.
+
+Returns
+-------
+x: numpy.array
+    Solution vector (or matrix) with the same shape as b
+
+"""
+    utils._checkDimensions(LU, b)
+    n = LU.shape[0]
+    h = _panelWidth(n, memory_limit, LU.itemsize)
+    X = np.asarray(b, dtype=float)[perm]
+    for k in range(0, n, h):
+        e = min(k + h, n)
+        block = np.array(LU[k:e, :e])
+        X[k:e] -= np.dot(block[:, :k], X[:k])
+        X[k:e] = solveLower(block[:, k:], X[k:e], unit_diagonal=True, overwrite_b=True)
+    for e in range(n, 0, -h):
+        k = max(e - h, 0)
+        block = np.array(LU[k:e, k:])
+        X[k:e] -= np.dot(block[:, e-k:], X[e:])
+        X[k:e] = solveUpper(block[:, :e-k], X[k:e], overwrite_b=True)
+    return X
+
+
+def _panelWidth(n, memory_limit, bytes_per_entry):
+    """Returns the number of columns (or rows) of length n that fit into the memory limit."""
+    return int(max(1, min(n, memory_limit // (bytes_per_entry * n))))
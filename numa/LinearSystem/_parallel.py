@@ -0,0 +1,70 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+TILE_SIZE = 256
+_num_threads = 1
+_pool = None
+_lock = threading.Lock()
+_worker = threading.local()
+
+
+def setNumThreads(num_threads=None):
+    """Sets the number of threads used for independent work in numa.LinearSystem, i.e. the column tiles of the
+trailing update in the blocked LU decomposition, the column blocks of multiple right-hand sides and the members
+of a batched solve. NumPy releases the GIL in these kernels, so the tiles run concurrently.
+
+
+Parameters
+----------
+num_threads: int, optional
+    Number of worker threads. 1 runs everything in the calling thread. Default set to None (number of cores).
+
+Notes
+-----
+The work is always split into tiles of the same size, independent of the number of threads, and every tile is
+written by exactly one thread. The results are therefore bitwise identical for any number of threads.
+
+"""
+    global _num_threads, _pool
+    if num_threads is None:
+        num_threads = os.cpu_count() or 1
+    if num_threads < 1:
+        raise ValueError("The number of threads has to be at least 1.")
+    with _lock:
+        if _pool is not None and not num_threads == _num_threads:
+            _pool.shutdown()
+            _pool = None
+        _num_threads = int(num_threads)
+
+
+def getNumThreads():
+    """Returns the number of threads used by numa.LinearSystem."""
+    return _num_threads
+
+
+def _tiles(n, size=TILE_SIZE):
+    """Splits range(n) into slices of the given size."""
+    return [slice(start, min(start + size, n)) for start in range(0, n, size)]
+
+
+def _forEach(function, items):
+    """Calls function for every item, in the thread pool if more than one thread is set. Calls from inside a
+worker run serially to avoid waiting on the own pool. Returns the results in the order of the items."""
+    global _pool
+    items = list(items)
+    if _num_threads == 1 or len(items) < 2 or getattr(_worker, "active", False):
+        return [function(item) for item in items]
+    with _lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=_num_threads)
+        pool = _pool
+    return list(pool.map(lambda item: _run(function, item), items))
+
+
+def _run(function, item):
+    _worker.active = True
+    try:
+        return function(item)
+    finally:
+        _worker.active = False
@@ -0,0 +1,65 @@
+import numpy as np
+
+
+def _refine(A, B, X, solve, tol=None, max_iterations=10):
+    """Iterative refinement of an approximate solution X of A X = B. The corrections are computed with an existing
+factorization of A, so every iteration costs one residual and one pair of triangular solves.
+
+
+Parameters
+----------
+A: numpy.arrays
+    Coefficient matrix in double precision
+B: numpy.array
+    Column vector of constant terms or matrix whose columns are right-hand sides
+X: numpy.array
+    Approximate solution, which is overwritten by the refined one
+solve: callable
+    Returns the solution of A D = R from a factorization of A
+tol: float, optional
+    Backward error that is accepted. Default set to the machine precision.
+max_iterations: int
+    Maximum number of refinement steps. Default set to 10
+
+Returns
+-------
+tuple
+    (refined solution, information whether the backward error fell below tol)
+
+Notes
+-----
+The normwise backward error of every column is
+
+.. math::
+
+    \\omega = \\frac{||b - A x||_\\infty}{||A||_\\infty ||x||_\\infty + ||b||_\\infty}
+
+The iteration stops as soon as it is below tol, if it did not at least halve during the last step or if the
+maximum number of iterations is reached.
+
+"""
+    if tol is None:
+        tol = np.finfo(float).eps
+    A_norm = _normInf(A)
+    B_norm = np.max(np.abs(B), axis=0)
+    previous_error = np.inf
+    for n in range(max_iterations + 1):
+        R = B - np.matmul(A, X)
+        scale = A_norm * np.max(np.abs(X), axis=0) + B_norm
+        residual = np.max(np.abs(R), axis=0)
+        backward_error = np.max(np.where(scale > 0, residual / np.where(scale > 0, scale, 1.), 0.))
+        if backward_error <= tol:
+            return X, True
+        if backward_error > previous_error / 2 or n == max_iterations:
+            return X, False
+        previous_error = backward_error
+        X += solve(R)
+
+
+def _normInf(A, chunk_bytes=2**20):
+    """Returns the infinity norm of A, i.e. the largest absolute row sum. The rows are processed in chunks, so no
+temporary of the size of A is allocated."""
+    A = np.asarray(A)
+    rows = max(1, chunk_bytes // (A.itemsize * max(A.shape[1], 1)))
+    return max((np.max(np.sum(np.abs(A[start:start+rows]), axis=1)) for start in range(0, A.shape[0], rows)),
+               default=0.)
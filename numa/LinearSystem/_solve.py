@@ -0,0 +1,141 @@
+import numpy as np
+from numa import utils
+from ._LU import solveLU
+from ._gauss import solveGauss
+from ._banded import solveBanded
+from ._cholesky import solveCholesky
+from ._sparse import CSRMatrix, solveSparse
+from ._triangular import solveLower, solveUpper
+
+METHODS = ("diagonal", "lower", "upper", "banded", "cholesky", "sparse", "lu", "gauss")
+
+
+def solve(A, b, method=None, giveInfo=False):
+    """Solves the given linear system of equations with the fastest applicable method. The structure of A is
+checked first, which costs O(n^2) and is much cheaper than a decomposition.
+
+
+Parameters
+----------
+A: numpy.arrays or CSRMatrix
+    Coefficient matrix
+b: numpy.array
+    Column vector of constant terms or n x k matrix whose columns are right-hand sides
+method: {None, 'diagonal', 'lower', 'upper', 'banded', 'cholesky', 'sparse', 'lu', 'gauss'}, optional
+    Method that should be used instead of the detected one. Default set to None (automatic choice).
+giveInfo: boolean, optional
+    Information whether a dictionary with the chosen method, the reason for the choice and the detected
+    structure should be returned as well.
+
+Returns
+-------
+x: numpy.array or tuple
+    Solution vector (or matrix) with the same shape as b, or (solution, info) if giveInfo is set
+
+Notes
+-----
+A CSRMatrix is always solved with 'sparse', see solveSparse. For a dense A the methods are tried in this order
+
+- 'diagonal', 'lower' or 'upper' if A has no nonzeros below and/or above the diagonal
+- 'banded' if the lower and upper bandwidth kl, ku satisfy 2 kl + ku + 1 <= n / 4, see solveBanded
+- 'cholesky' if A is symmetric with a positive diagonal, see solveCholesky. If the decomposition shows that A is
+  not positive definite, 'lu' is used.
+- 'sparse' if A has at most 5 percent nonzeros and n >= 200, see solveSparse
+- 'lu' otherwise, see solveLU
+
+"""
+    if method is not None and method not in METHODS:
+        raise ValueError(f"Unknown method {method}. Choose one of {METHODS}.")
+    if isinstance(A, CSRMatrix):
+        structure = {"shape": A.shape, "nnz": A.nnz}
+        if method not in (None, "sparse"):
+            raise ValueError("A CSRMatrix can only be solved with method 'sparse'.")
+        return _result(solveSparse(A, b), "sparse", "A is a CSRMatrix", structure, giveInfo)
+
+    utils._checkDimensions(A, b)
+    n = A.shape[0]
+    kl, ku = _bandwidth(A)
+    structure = {"shape": A.shape, "bandwidth": (kl, ku)}
+    if method is None:
+        method, reason = _choose(A, kl, ku, structure)
+    else:
+        reason = "chosen by the user"
+
+    if method == "diagonal":
+        d = np.diag(A).astype(float)
+        if np.any(d == 0):
+            raise utils.SingularityError("Input matrix is singular.")
+        x = np.asarray(b, dtype=float) / d.reshape((-1,) + (1,) * (np.ndim(b) - 1))
+    elif method == "lower":
+        x = solveLower(A, b)
+    elif method == "upper":
+        x = solveUpper(A, b)
+    elif method == "banded":
+        x = solveBanded((kl, ku), _bandStorage(A, kl, ku), b)
+    elif method == "cholesky":
+        try:
+            x = solveCholesky(A, b)
+        except utils.PositiveDefiniteError:
+            if not reason == "chosen by the user":
+                method, reason = "lu", "A is symmetric but not positive definite"
+                x = solveLU(A, b)
+            else:
+                raise
+    elif method == "sparse":
+        x = solveSparse(A, b)
+    elif method == "gauss":
+        x = solveGauss(A, b)
+    else:
+        x = solveLU(A, b)
+    return _result(x, method, reason, structure, giveInfo)
+
+
+def _choose(A, kl, ku, structure):
+    """Returns the method for the detected structure and the reason for it."""
+    n = A.shape[0]
+    if kl == 0 and ku == 0:
+        return "diagonal", "A is diagonal"
+    if ku == 0:
+        return "lower", "A is lower triangular"
+    if kl == 0:
+        return "upper", "A is upper triangular"
+    if 2 * kl + ku + 1 <= n / 4:
+        return "banded", f"A is banded with bandwidth ({kl}, {ku})"
+
+    structure["symmetric"] = np.array_equal(A, A.T)
+    if structure["symmetric"] and np.all(np.diag(A) > 0):
+        return "cholesky", "A is symmetric with a positive diagonal"
+
+    structure["density"] = np.count_nonzero(A) / n ** 2
+    if n >= 200 and structure["density"] <= 0.05:
+        return "sparse", f"only {100 * structure['density']:.1f} percent of A are nonzero"
+    return "lu", "A has no exploitable structure"
+
+
+def _bandwidth(A):
+    """Returns the number of subdiagonals and superdiagonals containing nonzeros."""
+    nonzero = A != 0
+    rows = np.nonzero(np.any(nonzero, axis=1))[0]
+    if len(rows) == 0:
+        return 0, 0
+    first = np.argmax(nonzero[rows], axis=1)
+    last = A.shape[1] - 1 - np.argmax(nonzero[rows, ::-1], axis=1)
+    return int(max(np.max(rows - first), 0)), int(max(np.max(last - rows), 0))
+
+
+def _bandStorage(A, kl, ku):
+    """Converts a dense banded matrix into LAPACK band storage ab[ku + i - j, j] = a_ij."""
+    n = A.shape[0]
+    ab = np.zeros((kl + ku + 1, n))
+    for offset in range(-kl, ku + 1):
+        if offset >= 0:
+            ab[ku - offset, offset:] = np.diagonal(A, offset)
+        else:
+            ab[ku - offset, :n + offset] = np.diagonal(A, offset)
+    return ab
+
+
+def _result(x, method, reason, structure, giveInfo):
+    if not giveInfo:
+        return x
+    return x, {"method": method, "reason": reason, "structure": structure}
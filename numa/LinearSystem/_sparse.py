@@ -0,0 +1,297 @@
+import numpy as np
+from numa import utils
+from ._LU import _permutationSign
+
+
+class CSRMatrix:
+    """Sparse matrix in compressed sparse row format. Only the nonzero entries are stored, row after row.
+
+
+Parameters
+----------
+data: numpy.array
+    Nonzero entries
+indices: numpy.array
+    Column index of every entry in data
+indptr: numpy.array
+    Entries of row i are data[indptr[i]:indptr[i+1]]
+shape: tuple
+    (number of rows, number of columns)
+
+Notes
+-----
+The transpose of a CSR matrix is the same matrix in compressed sparse column format, so transpose() provides the
+column oriented view as well.
+
+"""
+
+    def __init__(self, data, indices, indptr, shape):
+        self.data = np.asarray(data, dtype=float)
+        self.indices = np.asarray(indices, dtype=int)
+        self.indptr = np.asarray(indptr, dtype=int)
+        self.shape = tuple(shape)
+        if not len(self.indptr) == self.shape[0] + 1 or not len(self.data) == len(self.indices):
+            raise utils.DimensionError("Dimensions of data, indices and indptr do not match!")
+
+    @property
+    def nnz(self):
+        """Number of stored entries."""
+        return len(self.data)
+
+    @classmethod
+    def fromDense(cls, A):
+        """Creates a CSR matrix from the nonzero entries of a dense matrix."""
+        A = np.asarray(A, dtype=float)
+        rows, cols = np.nonzero(A)
+        indptr = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=A.shape[0]))))
+        return cls(A[rows, cols], cols, indptr, A.shape)
+
+    @classmethod
+    def fromTriplets(cls, rows, cols, values, shape):
+        """Creates a CSR matrix from (row, column, value) triplets. Values of duplicate positions are summed up."""
+        rows, cols = np.asarray(rows, dtype=int), np.asarray(cols, dtype=int)
+        keys, inverse = np.unique(rows * shape[1] + cols, return_inverse=True)
+        data = np.bincount(inverse.ravel(), weights=np.asarray(values, dtype=float), minlength=len(keys))
+        rows, cols = keys // shape[1], keys % shape[1]
+        indptr = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=shape[0]))))
+        return cls(data, cols, indptr, shape)
+
+    def _rowIndices(self):
+        return np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+
+    def _selectRows(self, rows):
+        """Returns the CSR matrix made of the given rows."""
+        starts, ends = self.indptr[rows], self.indptr[np.asarray(rows) + 1]
+        positions = np.concatenate([np.arange(s, e) for s, e in zip(starts, ends)] + [np.zeros(0, dtype=int)])
+        indptr = np.concatenate(([0], np.cumsum(ends - starts)))
+        return CSRMatrix(self.data[positions], self.indices[positions], indptr, (len(rows), self.shape[1]))
+
+    def toDense(self):
+        """Returns the matrix as dense numpy array."""
+        A = np.zeros(self.shape)
+        A[self._rowIndices(), self.indices] = self.data
+        return A
+
+    def transpose(self):
+        """Returns the transposed matrix."""
+        return CSRMatrix.fromTriplets(self.indices, self._rowIndices(), self.data, self.shape[::-1])
+
+    def diagonal(self):
+        """Returns the main diagonal as dense vector."""
+        rows = self._rowIndices()
+        on_diagonal = rows == self.indices
+        d = np.zeros(min(self.shape))
+        d[rows[on_diagonal]] = self.data[on_diagonal]
+        return d
+
+    def matvec(self, x):
+        """Returns the product of the matrix with a vector (or with every column of a matrix) x."""
+        x = np.asarray(x, dtype=float)
+        if not x.shape[0] == self.shape[1]:
+            raise utils.DimensionError("Dimensions of A and x do not match!")
+        products = self.data.reshape((-1,) + (1,) * (x.ndim - 1)) * x[self.indices]
+        y = np.zeros((self.shape[0],) + x.shape[1:])
+        nonempty = np.diff(self.indptr) > 0
+        if np.any(nonempty):
+            y[nonempty] = np.add.reduceat(products, self.indptr[:-1][nonempty], axis=0)
+        return y
+
+    def __matmul__(self, x):
+        return self.matvec(x)
+
+
+def reverseCuthillMcKee(A):
+    """Calculates the reverse Cuthill-McKee ordering of a sparse matrix. Renumbering rows and columns with it moves
+the nonzero entries close to the diagonal, which limits the fill-in of a later LU decomposition.
+
+
+Parameters
+----------
+A: CSRMatrix
+    Quadratic sparse matrix. Only its pattern, made symmetric, is used.
+
+Returns
+-------
+q: numpy.array
+    Permutation such that A[q][:, q] has a small bandwidth
+
+Notes
+-----
+Every connected component is traversed breadth-first starting at a node of minimal degree. Neighbours are visited
+in the order of increasing degree and the resulting order is reversed.
+
+References
+-------
+ [1] E. Cuthill, J. McKee, Reducing the bandwidth of sparse symmetric matrices, ACM '69 (1969)
+"""
+    n = A.shape[0]
+    rows, cols = A._rowIndices(), A.indices
+    off_diagonal = rows != cols
+    rows, cols = rows[off_diagonal], cols[off_diagonal]
+    adjacency = CSRMatrix.fromTriplets(np.concatenate((rows, cols)), np.concatenate((cols, rows)),
+                                       np.ones(2 * len(rows)), (n, n))
+    degree = np.diff(adjacency.indptr)
+
+    visited = np.zeros(n, dtype=bool)
+    order = []
+    for start in np.argsort(degree, kind="mergesort"):
+        if visited[start]:
+            continue
+        visited[start] = True
+        queue = [start]
+        head = 0
+        while head < len(queue):
+            i = queue[head]
+            head += 1
+            neighbours = adjacency.indices[adjacency.indptr[i]:adjacency.indptr[i+1]]
+            neighbours = neighbours[~visited[neighbours]]
+            neighbours = neighbours[np.argsort(degree[neighbours], kind="mergesort")]
+            visited[neighbours] = True
+            queue.extend(neighbours.tolist())
+        order.extend(queue)
+    return np.array(order[::-1], dtype=int)
+
+
+class SparseLUFactorization:
+    """Sparse LU decomposition with a fill-reducing ordering and threshold partial pivoting. Only nonzero entries
+of the matrix and of the factors are stored and touched, so memory and time depend on the number of nonzeros and
+the fill-in instead of n^2.
+
+
+Parameters
+----------
+A: CSRMatrix or numpy.arrays
+    Quadratic coefficient matrix
+ordering: {'rcm', None}, optional
+    Symmetric reordering applied before the decomposition. Default set to 'rcm' (reverse Cuthill-McKee).
+pivot_threshold: float, optional
+    Every entry of the pivot column that is at least pivot_threshold times its largest entry may become pivot.
+    The diagonal entry is preferred if it qualifies, otherwise the row with the fewest nonzeros is chosen to limit
+    the fill-in. 1 gives ordinary partial pivoting. Default set to 0.1
+
+Attributes
+----------
+q: numpy.array
+    Symmetric permutation of the ordering
+nnz: int
+    Number of nonzeros in L and U
+
+Raises
+------
+DimensionError
+    If A is not quadratic.
+SingularityError
+    If a pivot is not larger than n * eps * max|a_ij|.
+
+"""
+
+    def __init__(self, A, ordering="rcm", pivot_threshold=0.1):
+        if not isinstance(A, CSRMatrix):
+            A = CSRMatrix.fromDense(A)
+        m, n = A.shape
+        if not m == n:
+            raise utils.DimensionError("Input matrix A is not quadratic!")
+        if ordering == "rcm":
+            self.q = reverseCuthillMcKee(A)
+        elif ordering is None:
+            self.q = np.arange(n)
+        else:
+            raise ValueError(f"Unknown ordering {ordering}.")
+        self.n = n
+
+        position = np.empty(n, dtype=int)
+        position[self.q] = np.arange(n)
+        rows, columns = [], [set() for _ in range(n)]
+        for i, row in enumerate(self.q):
+            start, end = A.indptr[row], A.indptr[row+1]
+            entries = dict(zip(position[A.indices[start:end]].tolist(), A.data[start:end].tolist()))
+            rows.append(entries)
+            for j in entries:
+                columns[j].add(i)
+        zero_pivot = n * np.finfo(float).eps * (np.max(np.abs(A.data)) if A.nnz else 0.)
+
+        self.perm = np.empty(n, dtype=int)
+        self._L, self._U = [], []
+        self._pivots = np.empty(n)
+        for k in range(n):
+            candidates = {i: abs(rows[i][k]) for i in columns[k]}
+            largest = max(candidates.values()) if candidates else 0.
+            if largest <= zero_pivot:
+                raise utils.SingularityError("Input matrix is singular.")
+            if candidates.get(k, 0.) >= pivot_threshold * largest:
+                p = k                           # the diagonal keeps the ordering and avoids growth
+            else:
+                p = min((i for i, value in candidates.items() if value >= pivot_threshold * largest),
+                        key=lambda i: (len(rows[i]), i))
+            pivot_row = rows[p]
+            pivot = pivot_row.pop(k)
+            for j in pivot_row:
+                columns[j].discard(p)
+            columns[k].discard(p)
+
+            eliminated = list(columns[k])
+            multipliers = []
+            for i in eliminated:
+                row = rows[i]
+                f = row.pop(k) / pivot
+                multipliers.append(f)
+                for j, value in pivot_row.items():
+                    if j in row:
+                        row[j] -= f * value
+                    else:
+                        row[j] = -f * value
+                        columns[j].add(i)
+            columns[k] = set()
+            rows[p] = None
+
+            self.perm[k] = p
+            self._pivots[k] = pivot
+            self._L.append((np.array(eliminated, dtype=int), np.array(multipliers)))
+            self._U.append((np.array(list(pivot_row.keys()), dtype=int), np.array(list(pivot_row.values()))))
+        self.nnz = n + sum(len(l) + len(u) for (l, _), (u, _) in zip(self._L, self._U))
+
+    def solve(self, b):
+        """Solves A x = b for a column vector b (or a matrix whose columns are right-hand sides)."""
+        b = np.asarray(b, dtype=float)
+        if not b.shape[0] == self.n:
+            raise utils.DimensionError("Dimensions of A and b do not match!")
+        w = b[self.q]
+        z = np.empty_like(w)
+        for k in range(self.n):
+            z[k] = w[self.perm[k]]
+            rows, multipliers = self._L[k]
+            if len(rows):
+                w[rows] -= np.multiply.outer(multipliers, z[k])
+        for k in range(self.n - 1, -1, -1):
+            cols, values = self._U[k]
+            z[k] = (z[k] - np.dot(values, z[cols])) / self._pivots[k]
+        x = np.empty_like(z)
+        x[self.q] = z
+        return x
+
+    def slogdet(self):
+        """Returns the sign and the natural logarithm of the absolute value of the determinant of A."""
+        sign = _permutationSign(self.perm) * np.prod(np.sign(self._pivots))
+        return float(sign), float(np.sum(np.log(np.abs(self._pivots))))
+
+
+def solveSparse(A, b, ordering="rcm"):
+    """Solves the given sparse linear system of equations using a sparse LU decomposition.
+
+
+Parameters
+----------
+A: CSRMatrix or numpy.arrays
+    Quadratic coefficient matrix
+b: numpy.array
+    Column vector of constant terms or n x k matrix whose columns are right-hand sides
+ordering: {'rcm', None}, optional
+    Fill-reducing ordering, see SparseLUFactorization. Default set to 'rcm'.
+
+Returns
+-------
+x: numpy.array
+    Solution vector (or matrix) with the same shape as b
+
+"""
+    return SparseLUFactorization(A, ordering=ordering).solve(b)
@@ -0,0 +1,223 @@
+import numpy as np
+from numa import utils
+from ._sparse import CSRMatrix
+from ._krylov import _result
+
+
+def jacobi(A, b, x0=None, tol=1e-10, max_iterations=10000, giveIterations=False):
+    """Solves the given linear system of equations using the Jacobi method. Every sweep updates all unknowns at once,
+so it only needs one product with A. Converges for strictly diagonally dominant matrices.
+
+
+Parameters
+----------
+A: numpy.arrays or CSRMatrix
+    Coefficient matrix
+b: numpy.array
+    Column vector of constant terms
+x0: numpy.array, optional
+    Initial guess of the solution. Default set to the zero vector.
+tol: float, optional
+    Relative residual ||b - A x|| / ||b|| at which the iteration stops. Default set to 1e-10
+max_iterations: int
+    Maximum number of sweeps until the loop breaks. Default set to 10000
+giveIterations: boolean, optional
+    Information whether the relative residual of every sweep should be returned or not.
+
+Returns
+-------
+tuple
+    (solution vector, relative residual, convergence)
+
+Notes
+-----
+.. math::
+
+    x^{(k+1)} = x^{(k)} + D^{-1}(b - A x^{(k)})
+
+with D the diagonal of A.
+
+"""
+    A, b, x, d, b_norm = _setup(A, b, x0)
+    convergence = list()
+    for n in range(max_iterations+1):
+        r = b - A.matvec(x)
+        err = np.linalg.norm(r) / b_norm
+        if n > 0:
+            convergence.append((n, err))
+        if err < tol:
+            return _result(x, err, convergence, giveIterations)
+        x += r / d
+    raise utils.MaximumIterationError(max_iterations)
+
+
+def gaussSeidel(A, b, x0=None, tol=1e-10, max_iterations=10000, ordering="natural", giveIterations=False):
+    """Solves the given linear system of equations using the Gauss-Seidel method, which is the SOR method with
+relaxation factor one. Converges for strictly diagonally dominant and for symmetric positive definite matrices.
+
+
+Parameters
+----------
+A: numpy.arrays or CSRMatrix
+    Coefficient matrix
+b: numpy.array
+    Column vector of constant terms
+x0: numpy.array, optional
+    Initial guess of the solution. Default set to the zero vector.
+tol: float, optional
+    Relative residual ||b - A x|| / ||b|| at which the iteration stops. Default set to 1e-10
+max_iterations: int
+    Maximum number of sweeps until the loop breaks. Default set to 10000
+ordering: {'natural', 'red-black'}, optional
+    Order in which the unknowns are updated, see sor. Default set to 'natural'.
+giveIterations: boolean, optional
+    Information whether the relative residual of every sweep should be returned or not.
+
+Returns
+-------
+tuple
+    (solution vector, relative residual, convergence)
+
+"""
+    return sor(A, b, omega=1., x0=x0, tol=tol, max_iterations=max_iterations, ordering=ordering,
+               giveIterations=giveIterations)
+
+
+def sor(A, b, omega=None, x0=None, tol=1e-10, max_iterations=10000, ordering="natural", giveIterations=False):
+    """Solves the given linear system of equations using the successive over-relaxation (SOR) method.
+
+
+Parameters
+----------
+A: numpy.arrays or CSRMatrix
+    Coefficient matrix
+b: numpy.array
+    Column vector of constant terms
+omega: float, optional
+    Relaxation factor in (0, 2). Default set to None (estimated from the Jacobi iteration).
+x0: numpy.array, optional
+    Initial guess of the solution. Default set to the zero vector.
+tol: float, optional
+    Relative residual ||b - A x|| / ||b|| at which the iteration stops. Default set to 1e-10
+max_iterations: int
+    Maximum number of sweeps until the loop breaks. Default set to 10000
+ordering: {'natural', 'red-black'}, optional
+    Order in which the unknowns are updated. 'natural' updates one unknown after the other. 'red-black' colors the
+    unknowns so that unknowns of the same color are not coupled and updates each color at once. Matrices from
+    five-point stencils need two colors, other matrices may need more. Default set to 'natural'.
+giveIterations: boolean, optional
+    Information whether the relative residual of every sweep should be returned or not.
+
+Returns
+-------
+tuple
+    (solution vector, relative residual, convergence)
+
+Notes
+-----
+Every unknown is updated with the newest values of all others
+
+.. math::
+
+    x_i = (1 - \\omega) x_i + \\frac{\\omega}{a_{ii}}(b_i - \\sum_{j \\neq i} a_{ij} x_j)
+
+If omega is not given, the spectral radius rho of the Jacobi iteration matrix is estimated with a few power
+iterations and the optimal factor for consistently ordered matrices is used
+
+.. math::
+
+    \\omega = \\frac{2}{1 + \\sqrt{1 - \\rho^2}}
+
+References
+-------
+ [1] Y. Saad, Iterative Methods for Sparse Linear Systems, 2nd edition, SIAM (2003), Chapter 4
+"""
+    A, b, x, d, b_norm = _setup(A, b, x0)
+    if omega is None:
+        omega = _optimalRelaxation(A, d)
+    if ordering == "natural":
+        sweep = _naturalSweep(A, b, d, omega)
+    elif ordering == "red-black":
+        sweep = _coloredSweep(A, b, d, omega)
+    else:
+        raise ValueError(f"Unknown ordering {ordering}.")
+
+    convergence = list()
+    err = np.linalg.norm(b - A.matvec(x)) / b_norm
+    if err < tol:
+        return _result(x, err, convergence, giveIterations)
+    for n in range(1, max_iterations+1):
+        sweep(x)
+        err = np.linalg.norm(b - A.matvec(x)) / b_norm
+        convergence.append((n, err))
+        if err < tol:
+            return _result(x, err, convergence, giveIterations)
+    raise utils.MaximumIterationError(n)
+
+
+def _naturalSweep(A, b, d, omega):
+    data, indices, indptr = A.data, A.indices, A.indptr
+
+    def sweep(x):
+        for i in range(len(b)):
+            start, end = indptr[i], indptr[i+1]
+            x[i] += omega * (b[i] - np.dot(data[start:end], x[indices[start:end]])) / d[i]
+    return sweep
+
+
+def _coloredSweep(A, b, d, omega):
+    classes = []
+    for rows in _colorClasses(A):
+        classes.append((rows, A._selectRows(rows), omega * b[rows] / d[rows], omega / d[rows]))
+
+    def sweep(x):
+        for rows, A_rows, b_rows, scale in classes:
+            x[rows] += b_rows - scale * A_rows.matvec(x)
+    return sweep
+
+
+def _colorClasses(A):
+    """Greedy coloring of the (symmetric) matrix graph. Unknowns of the same color are not coupled."""
+    n = A.shape[0]
+    rows = np.repeat(np.arange(n), np.diff(A.indptr))
+    off_diagonal = rows != A.indices
+    rows, cols = rows[off_diagonal], A.indices[off_diagonal]
+    graph = CSRMatrix.fromTriplets(np.concatenate((rows, cols)), np.concatenate((cols, rows)),
+                                   np.ones(2 * len(rows)), (n, n))
+    colors = np.full(n, -1)
+    for i in range(n):
+        used = set(colors[graph.indices[graph.indptr[i]:graph.indptr[i+1]]].tolist())
+        color = 0
+        while color in used:
+            color += 1
+        colors[i] = color
+    return [np.nonzero(colors == color)[0] for color in range(colors.max() + 1)]
+
+
+def _optimalRelaxation(A, d, iterations=50):
+    """Estimates the optimal SOR factor from the spectral radius of the Jacobi iteration matrix I - D^{-1} A."""
+    v = np.random.RandomState(0).rand(len(d))
+    rho = 0.
+    for _ in range(iterations):
+        v /= np.linalg.norm(v)
+        w = v - A.matvec(v) / d
+        w = w - A.matvec(w) / d                 # J^2 v, positive eigenvalues rho^2
+        rho = np.sqrt(np.linalg.norm(w))
+        v = w
+    if rho >= 1:
+        return 1.
+    return 2. / (1. + np.sqrt(1. - rho ** 2))
+
+
+def _setup(A, b, x0):
+    if not isinstance(A, CSRMatrix):
+        A = CSRMatrix.fromDense(A)
+    b = np.asarray(b, dtype=float)
+    if not b.ndim == 1 or not A.shape == (len(b), len(b)):
+        raise utils.DimensionError("Dimensions of A and b do not match!")
+    d = A.diagonal()
+    if np.any(d == 0):
+        raise utils.MethodStuckError("Diagonal of A contains a zero.")
+    x = np.zeros(len(b)) if x0 is None else np.array(x0, dtype=float)
+    b_norm = np.linalg.norm(b)
+    return A, b, x, d, b_norm if b_norm > 0 else 1.
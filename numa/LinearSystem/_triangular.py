@@ -0,0 +1,103 @@
+import numpy as np
+from numa import utils
+
+
+def solveLower(L, b, unit_diagonal=False, trans=False, overwrite_b=False):
+    """Solves the linear system of equations with a lower triangular coefficient matrix using forward substitution.
+
+
+Parameters
+----------
+L: numpy.arrays
+    Lower triangular matrix. Entries above the diagonal are ignored.
+b: numpy.array
+    Column vector of constant terms or n x k matrix whose columns are right-hand sides
+unit_diagonal: boolean, optional
+    Information whether the diagonal of L should be assumed to be one (it is not read then). Default set to False.
+trans: boolean, optional
+    Information whether the transposed system (an upper triangular one) should be solved. Default set to False.
+overwrite_b: boolean, optional
+    Information whether b may be overwritten with the solution. Default set to False.
+
+Returns
+-------
+x: numpy.array
+    Solution vector (or matrix) with the same shape as b
+
+Notes
+-----
+Every row of the solution is computed with a single dot product
+
+.. math::
+
+    x_i = l_{ii}^{-1}(b_i - \\sum_{k=1}^{i-1}l_{ik}x_k)
+
+"""
+    L, X = _prepare(L, b, unit_diagonal, overwrite_b)
+    if trans:
+        return _backward(L.T, X, unit_diagonal)
+    return _forward(L, X, unit_diagonal)
+
+
+def solveUpper(U, b, unit_diagonal=False, trans=False, overwrite_b=False):
+    """Solves the linear system of equations with an upper triangular coefficient matrix using backwards substitution.
+
+
+Parameters
+----------
+U: numpy.arrays
+    Upper triangular matrix. Entries below the diagonal are ignored.
+b: numpy.array
+    Column vector of constant terms or n x k matrix whose columns are right-hand sides
+unit_diagonal: boolean, optional
+    Information whether the diagonal of U should be assumed to be one (it is not read then). Default set to False.
+trans: boolean, optional
+    Information whether the transposed system (a lower triangular one) should be solved. Default set to False.
+overwrite_b: boolean, optional
+    Information whether b may be overwritten with the solution. Default set to False.
+
+Returns
+-------
+x: numpy.array
+    Solution vector (or matrix) with the same shape as b
+
+Notes
+-----
+Every row of the solution is computed with a single dot product
+
+.. math::
+
+    x_i = u_{ii}^{-1}(b_i - \\sum_{k=i+1}^{n}u_{ik}x_k)
+
+"""
+    U, X = _prepare(U, b, unit_diagonal, overwrite_b)
+    if trans:
+        return _forward(U.T, X, unit_diagonal)
+    return _backward(U, X, unit_diagonal)
+
+
+def _prepare(T, b, unit_diagonal, overwrite_b):
+    T = np.asarray(T)
+    utils._checkDimensions(T, b)
+    if not unit_diagonal and np.any(np.diag(T) == 0):
+        raise utils.SingularityError("Triangular matrix has a zero on its diagonal.")
+    if overwrite_b and isinstance(b, np.ndarray) and b.dtype == float:
+        return T, b
+    return T, np.array(b, dtype=float, order="C")
+
+
+def _forward(T, X, unit_diagonal):
+    for i in range(T.shape[0]):
+        if i > 0:
+            X[i] -= np.dot(T[i, :i], X[:i])
+        if not unit_diagonal:
+            X[i] /= T[i, i]
+    return X
+
+
+def _backward(T, X, unit_diagonal):
+    for i in range(T.shape[0] - 1, -1, -1):
+        X[i] -= np.dot(T[i, i+1:], X[i+1:])
+        if not unit_diagonal:
+            X[i] /= T[i, i]
+    return X
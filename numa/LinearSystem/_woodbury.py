@@ -0,0 +1,52 @@
+import numpy as np
+from numa import utils
+from ._LU import LUFactorization
+
+
+def solveWoodbury(factorization, U, V, b):
+    """Solves the modified system (A + U V^T) x = b with an existing factorization of A using the
+Sherman-Morrison-Woodbury formula. A is not decomposed again, so a rank k modification costs O(n^2 k).
+
+
+Parameters
+----------
+factorization: LUFactorization, CholeskyFactorization or LDLFactorization
+    Factorization of A
+U: numpy.arrays
+    n x k matrix (or vector for k = 1)
+V: numpy.arrays
+    n x k matrix (or vector for k = 1)
+b: numpy.array
+    Column vector of constant terms or n x m matrix whose columns are right-hand sides
+
+Returns
+-------
+x: numpy.array
+    Solution vector (or matrix) with the same shape as b
+
+Raises
+------
+SingularityError
+    If the capacitance matrix I + V^T A^-1 U and therefore A + U V^T is singular.
+
+Notes
+-----
+With the solutions of A Y = b and A Z = U the solution is
+
+.. math::
+
+    x = Y - Z \\cdot (I + V^T \\cdot Z)^{-1} \\cdot V^T \\cdot Y
+
+where only the small k x k capacitance matrix has to be decomposed. For k = 1 this is the Sherman-Morrison
+formula. The formula can be unstable if the capacitance matrix is badly conditioned, in which case A + U V^T
+should be decomposed directly.
+
+"""
+    U = np.asarray(U, dtype=float).reshape(factorization.n, -1)
+    V = np.asarray(V, dtype=float).reshape(factorization.n, -1)
+    if not U.shape == V.shape:
+        raise utils.DimensionError("U and V need the same number of columns!")
+    Y = factorization.solve(b)
+    Z = factorization.solve(U)
+    capacitance = LUFactorization(np.identity(U.shape[1]) + np.matmul(V.T, Z))
+    return Y - np.matmul(Z, capacitance.solve(np.matmul(V.T, Y)))
@@ -1,5 +1,6 @@
 import numpy as np
-from numa.LinearSystem import LU, solveGauss, solveLU
+from numa.LinearSystem import LU, LUFactorization, cholesky, solveGauss
+from numa.LinearSystem._LU import _factorLU, _luSlogdet, _luSubstitute, _pivotScale, _singularPivots
 
 
 class MaximumIterationError(Exception):
@@ -54,20 +55,37 @@ class SingularityError(Exception):
         super().__init__(self.message)
 
 
+class PositiveDefiniteError(Exception):
+    """Exception raised when a matrix is not positive definite.
+
+    Attributes:
+        reason -- reason given why the method can't proceed
+    """
+
+    def __init__(self, reason):
+        self.reason = reason
+        self.message = f"{self.reason}"
+        super().__init__(self.message)
+
+
 def _checkDimensions(A, b):
     if not A.shape[0] == A.shape[1]:
         raise DimensionError("Input matrix A is not quadratic!")
     if not b.shape[0] == A.shape[1]:
         raise DimensionError("Dimensions of A and b do not match!")
+    if b.ndim > 2:
+        raise DimensionError("b has to be a column vector or a matrix of column vectors!")
 
 
-def det(A):
+def det(A, factorization=None):
     """Returns determinant of A.
 
 Parameters
 ----------
 A: numpy.arrays
     Matrix
+factorization: object, optional
+    Existing factorization of A (e.g. LinearSystem.LUFactorization) that should be reused. Default set to None.
 
 Returns
 -------
@@ -76,10 +94,47 @@ D: numpy.arrays
 
 Notes
 -----
-Currently this function is only calling the numpy function under the hood until the LU problems are fixed.
+The determinant is calculated from the LU decomposition with partial pivoting, see slogdet.
 
 """
-    return np.linalg.det(A)
+    sign, logdet = slogdet(A, factorization=factorization)
+    return sign * np.exp(logdet)
+
+
+def slogdet(A, factorization=None):
+    """Returns the sign and the natural logarithm of the absolute value of the determinant of A. Unlike the
+determinant itself this does not overflow or underflow for large matrices.
+
+Parameters
+----------
+A: numpy.arrays
+    Matrix
+factorization: object, optional
+    Existing factorization of A (e.g. LinearSystem.LUFactorization) that should be reused. Default set to None.
+
+Returns
+-------
+tuple
+    (sign, logdet) with det(A) = sign * exp(logdet). For a singular matrix (0, -inf) is returned.
+
+Notes
+-----
+From P A = L U and the unit diagonal of L follows
+
+.. math::
+
+    \\log|det(A)| = \\sum_{i=1}^{n} \\log|u_{ii}|
+
+and the sign is the product of the signs of the pivots and of the permutation.
+
+"""
+    if factorization is not None:
+        return factorization.slogdet()
+    m, n = A.shape
+    if not m == n:
+        raise DimensionError("Input matrix A is not quadratic!")
+    packed, perm = _factorLU(A)
+    return _luSlogdet(packed, perm)
 
 
 def isSingular(A):
@@ -97,43 +152,121 @@ T,F: boolean
 
 Notes
 -----
-Currently only checks determinant.
+A is decomposed with partial pivoting and treated as singular if one of the pivots is not larger than
+
+.. math::
+
+    n \\cdot \\epsilon \\cdot min(max_k|a_{ik}|, max_k|a_{kj}|)
+
+where i and j are the row and column of A the pivot was taken from. This is the tolerance the solvers of
+numa.LinearSystem raise a SingularityError with. Unlike a check of the determinant this does not underflow or
+overflow for large or badly scaled matrices.
 
 """
-    if np.allclose(det(A), 0., atol=10e-14):
-        return True
-    else:
+    m, n = A.shape
+    if not m == n:
+        raise DimensionError("Input matrix A is not quadratic!")
+    packed, perm = _factorLU(A)
+    return bool(np.any(_singularPivots(packed, _pivotScale(A, perm))))
+
+
+def isPositiveDefinite(A):
+    """Checks if matrix A is symmetric positive definite or not.
+
+Parameters
+----------
+A: numpy.arrays
+    Matrix
+
+Returns
+-------
+T,F: boolean
+    True if matrix is symmetric positive definite, False if not.
+
+Notes
+-----
+Tries the Cholesky decomposition, which fails exactly for matrices that are not positive definite. This costs
+a third of an LU decomposition and much less than computing the eigenvalues.
+
+"""
+    m, n = A.shape
+    if not m == n or not np.allclose(A, A.T):
+        return False
+    try:
+        cholesky(A)
+    except PositiveDefiniteError:
         return False
+    return True
+
+
+def rank(A):
+    """Estimates the rank of matrix A from the pivots of its LU decomposition.
+
+Parameters
+----------
+A: numpy.arrays
+    Matrix
+
+Returns
+-------
+r: int
+    Number of pivots larger than n * eps * max|a_ij|
+
+Notes
+-----
+Partial pivoting does not reveal the rank reliably for every matrix, so the result is an estimate.
 
+Unlike isSingular and the solvers, every pivot is compared with the normwise tolerance
 
-def inverse(A):
+.. math::
+
+    n \\cdot \\epsilon \\cdot max_{i,j}|a_{ij}|
+
+so rows that are negligible compared to the whole matrix do not count. A badly scaled matrix can therefore have a
+rank below n although isSingular does not report it as singular.
+
+"""
+    if A.shape[0] < A.shape[1]:
+        A = A.T
+    packed, perm = _factorLU(A)
+    return int(np.count_nonzero(~_singularPivots(packed, np.max(np.abs(A)))))
+
+
+def inverse(A, out=None):
     """Calculates the inverse matrix of A such that
 
 .. math::
 
-    A \cdot A^{-1} = I
+    A \\cdot A^{-1} = I
 
 Parameters
 ----------
 A: numpy.arrays
     Matrix
+out: numpy.arrays, optional
+    Array of the same shape as A the inverse is written into. Default set to None (a new array is allocated).
 
 Returns
 -------
 inverseA: numpy.arrays
     Inverse matrix of A
 
+Notes
+-----
+A is decomposed only once into P A = L U, which raises a SingularityError if one of its pivots vanishes. The
+columns of P are then written into the output and all of them are solved together by forward and backwards
+substitution, overwriting the output in place.
+
 """
     m, n = A.shape
     if not m == n:
         raise DimensionError("Input matrix A is not quadratic!")
-    if isSingular(A):
-        raise SingularityError("Input matrix is singular.")
-    I = np.identity(m)
-    inverseA = np.zeros((m, m))
-
-    for i in range(m):
-        b = I[:, i]
-        x = solveLU(A, b)
-        inverseA[:, i] = x
-    return inverseA
+    if out is None:
+        out = np.empty((m, m))
+    elif not out.shape == (m, m):
+        raise DimensionError("Dimensions of A and out do not match!")
+
+    factorization = LUFactorization(A)
+    out.fill(0.)
+    out[np.arange(m), factorization.perm] = 1.
+    return _luSubstitute(factorization.LU, out)
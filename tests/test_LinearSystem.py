@@ -97,3 +97,898 @@ def test_LU_singularMatrix():
 
     with pytest.raises(utils.SingularityError):
         x = LinearSystem.solveLU(A, b)
+
+    A = np.arange(1., 10.).reshape(3, 3)
+    for solver in (LinearSystem.solveLU, LinearSystem.solveGauss):
+        with pytest.raises(utils.SingularityError):
+            solver(A, b)
+
+
+def test_solve_rowScaledMatrix():
+    import numpy as np
+    from numa import LinearSystem
+
+    A = np.diag([1., 1e-20])
+    b = np.array([1., 1e-20])
+    for x in (LinearSystem.solveLU(A, b), LinearSystem.solveGauss(A, b), LinearSystem.LUFactorization(A).solve(b)):
+        assert np.allclose(x, np.ones(2), rtol=1e-14, atol=0), "Row-scaled matrix is not solved correctly"
+
+    A = np.array([[1e10, 1e30], [1., 1.]])                  # first pivot is tiny compared to its row only
+    b = np.array([1e30, 2.])
+    for x in (LinearSystem.solveLU(A, b), LinearSystem.solveGauss(A, b), LinearSystem.LUFactorization(A).solve(b)):
+        assert np.max(np.abs(np.matmul(A, x) - b)) <= 1e-14 * np.max(np.abs(b)), \
+            "Row-scaled matrix is not solved with a small backward error"
+
+    np.random.seed(9)
+    A = np.random.rand(40, 40) * 10. ** np.random.uniform(-8, 8, size=(40, 1))
+    b = np.random.rand(40)
+    x_true = np.linalg.solve(A, b)
+    for x in (LinearSystem.solveLU(A, b), LinearSystem.solveGauss(A, b)):
+        assert np.allclose(x, x_true, rtol=1e-10, atol=0), "Row-scaled matrix is not solved correctly"
+
+
+def test_LU_pivoting():
+    import numpy as np
+    from numa import LinearSystem
+    tol = 1e-12
+
+    A = np.array([[0, 2, 1], [1, 1, 1], [4, 0, 3]], dtype=float)
+    P, L, U = LinearSystem.LU(A, pivoting=True)
+    assert np.allclose(np.matmul(P, A), np.matmul(L, U), atol=tol) and np.allclose(
+        np.triu(L, 1), 0.) and np.allclose(np.tril(U, -1), 0.), "LinearSystem.LU does not agree with known solution"
+
+    np.random.seed(0)
+    A = np.random.rand(60, 60)
+    P, L, U = LinearSystem.LU(A, pivoting=True)
+    assert np.allclose(np.matmul(P, A), np.matmul(L, U), atol=tol) and np.max(
+        np.abs(L)) <= 1., "LinearSystem.LU does not agree with known solution"
+
+
+def test_LU_zeroPivot():
+    import numpy as np
+    from numa import LinearSystem, utils
+    import pytest
+
+    A = np.array([[0, 2, 1], [1, 1, 1], [4, 0, 3]], dtype=float)
+    with pytest.raises(utils.MethodStuckError):
+        L, U = LinearSystem.LU(A)
+
+
+def test_LU_blocked():
+    import numpy as np
+    from numa import LinearSystem
+    tol = 1e-12
+
+    np.random.seed(1)
+    A = np.random.rand(70, 70)
+    P, L, U = LinearSystem.LU(A, pivoting=True)
+    P_b, L_b, U_b = LinearSystem.LU(A, pivoting=True, block_size=16)
+    assert np.allclose(P, P_b) and np.allclose(L, L_b, atol=tol) and np.allclose(
+        U, U_b, atol=tol), "Blocked LinearSystem.LU does not agree with the unblocked decomposition"
+
+    A = np.array([[2, -1, -2], [-4, 6, 3], [-4, -2, 8]], dtype=float)
+    L, U = LinearSystem.LU(A, block_size=2)
+    assert np.allclose(np.matmul(L, U), A, atol=tol), "Blocked LinearSystem.LU does not agree with known solution"
+
+
+def test_LUFactorization():
+    import numpy as np
+    from numa import LinearSystem
+    tol = 1e-13
+
+    A = np.array([[7, -1, 0], [4, 6, -3],
+                  [-2, 6, 1]], dtype=float)
+    b = np.array([5, 7, 13], dtype=float)
+    true_solution = np.array([1, 2, 3], dtype=float)
+
+    factorization = LinearSystem.LUFactorization(A)
+    assert np.allclose(factorization.solve(b), true_solution,
+                       atol=tol), "LUFactorization.solve does not agree with known solution"
+
+    B = np.column_stack((b, 2 * b, np.matmul(A, np.ones(3))))
+    X = factorization.solve_many(B)
+    assert np.allclose(X, np.column_stack((true_solution, 2 * true_solution, np.ones(3))),
+                       atol=tol), "LUFactorization.solve_many does not agree with known solution"
+
+    assert np.allclose(factorization.det(), 166., atol=tol), "LUFactorization.det does not agree with known solution"
+    assert np.allclose(factorization.cond_estimate(), np.linalg.cond(A, p=1),
+                       atol=tol), "LUFactorization.cond_estimate does not agree with known solution"
+
+
+def test_LUFactorization_singularMatrix():
+    import numpy as np
+    from numa import LinearSystem, utils
+    import pytest
+
+    A = np.array([[0, 2, 1], [1, 1, 1], [4, 0, 2]], dtype=float)
+    with pytest.raises(utils.SingularityError):
+        LinearSystem.LUFactorization(A)
+
+
+def test_multipleRightHandSides():
+    import numpy as np
+    from numa import LinearSystem
+    tol = 1e-13
+
+    A = np.array([[7, -1, 0], [4, 6, -3],
+                  [-2, 6, 1]], dtype=float)
+    X_true = np.array([[1, 0, -1], [2, 1, 0.5], [3, 0, 2]], dtype=float)
+    B = np.matmul(A, X_true)
+
+    X_gauss = LinearSystem.solveGauss(A, B)
+    X_LU = LinearSystem.solveLU(A, B)
+    assert X_gauss.shape == B.shape and np.allclose(
+        X_gauss, X_true, atol=tol), "LinearSystem.solveGauss does not agree with known solution"
+    assert X_LU.shape == B.shape and np.allclose(
+        X_LU, X_true, atol=tol), "LinearSystem.solveLU does not agree with known solution"
+
+
+def test_solveBatched():
+    import numpy as np
+    from numa import LinearSystem
+    tol = 1e-10
+
+    np.random.seed(4)
+    A = np.random.rand(200, 6, 6)
+    A[3] = np.array([[0, 2, 1, 0, 0, 0], [1, 1, 1, 0, 0, 0], [4, 0, 2, 0, 0, 0],
+                     [0, 0, 0, 1, 0, 0], [0, 0, 0, 0, 1, 0], [0, 0, 0, 0, 0, 1]], dtype=float)
+    b = np.random.rand(200, 6)
+    B = np.random.rand(200, 6, 3)
+
+    x, singular = LinearSystem.solveBatched(A, b)
+    X, _ = LinearSystem.solveBatched(A, B)
+    regular = np.arange(200) != 3
+    assert singular[3] and np.count_nonzero(singular) == 1 and np.all(
+        np.isnan(x[3])), "LinearSystem.solveBatched does not detect the singular system"
+    assert np.allclose(x[regular], np.linalg.solve(A[regular], b[regular][:, :, None])[:, :, 0],
+                       atol=tol), "LinearSystem.solveBatched does not agree with known solution"
+    assert np.allclose(X[regular], np.linalg.solve(A[regular], B[regular]),
+                       atol=tol), "LinearSystem.solveBatched does not agree with known solution"
+
+
+def test_triangularSolve():
+    import numpy as np
+    from numa import LinearSystem
+    tol = 1e-12
+
+    np.random.seed(5)
+    T = np.random.rand(30, 30) + 30 * np.identity(30)
+    L, U = np.tril(T), np.triu(T)
+    B = np.random.rand(30, 4)
+    b = B[:, 0]
+
+    x = LinearSystem.solveLower(L, b)
+    assert isinstance(x, np.ndarray) and np.allclose(np.matmul(L, x), b, atol=tol), \
+        "LinearSystem.solveLower does not agree with known solution"
+    X = LinearSystem.solveUpper(U, B)
+    assert X.flags["C_CONTIGUOUS"] and np.allclose(np.matmul(U, X), B, atol=tol), \
+        "LinearSystem.solveUpper does not agree with known solution"
+
+    L_unit = np.tril(T, -1) + np.identity(30)
+    X = LinearSystem.solveLower(T, B, unit_diagonal=True, trans=True)
+    assert np.allclose(np.matmul(L_unit.T, X), B, atol=tol), \
+        "LinearSystem.solveLower does not agree with known solution"
+    X = LinearSystem.solveUpper(U, B, trans=True)
+    assert np.allclose(np.matmul(U.T, X), B, atol=tol), \
+        "LinearSystem.solveUpper does not agree with known solution"
+
+
+def test_triangularSolve_singularMatrix():
+    import numpy as np
+    from numa import LinearSystem, utils
+    import pytest
+
+    U = np.array([[1, 2, 3], [0, 0, 1], [0, 0, 2]], dtype=float)
+    b = np.array([1, 1, 1], dtype=float)
+    with pytest.raises(utils.SingularityError):
+        LinearSystem.solveUpper(U, b)
+
+
+def test_solveLU_mixedPrecision():
+    import numpy as np
+    from numa import LinearSystem
+    tol = 1e-12
+
+    np.random.seed(6)
+    A = np.random.rand(80, 80) + 10 * np.identity(80)
+    x_true = np.random.rand(80)
+    b = np.matmul(A, x_true)
+
+    x_calculated = LinearSystem.solveLU(A, b, mixed_precision=True)
+    assert np.allclose(x_calculated, x_true, atol=tol, rtol=0), \
+        "LinearSystem.solveLU does not agree with known solution in mixed precision"
+
+    x_calculated = LinearSystem.solveGauss(A, b, max_iterations=3)
+    assert np.allclose(x_calculated, x_true, atol=tol, rtol=0), \
+        "LinearSystem.solveGauss does not agree with known solution"
+
+
+def _poissonMatrix(m):
+    from numa import LinearSystem
+    rows, cols, values = [], [], []
+    for i in range(m):
+        for j in range(m):
+            k = i * m + j
+            rows.append(k), cols.append(k), values.append(4.)
+            for di, dj in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+                if 0 <= i + di < m and 0 <= j + dj < m:
+                    rows.append(k), cols.append((i + di) * m + j + dj), values.append(-1.)
+    return LinearSystem.CSRMatrix.fromTriplets(rows, cols, values, (m * m, m * m))
+
+
+def test_CSRMatrix():
+    import numpy as np
+    from numa import LinearSystem
+    tol = 1e-14
+
+    A = np.array([[7, -1, 0], [4, 0, -3],
+                  [0, 0, 0]], dtype=float)
+    A_sparse = LinearSystem.CSRMatrix.fromDense(A)
+    x = np.array([1, 2, 3], dtype=float)
+    assert A_sparse.nnz == 4 and np.allclose(A_sparse.toDense(), A, atol=tol)
+    assert np.allclose(A_sparse @ x, np.matmul(A, x), atol=tol), "CSRMatrix.matvec does not agree with known solution"
+    assert np.allclose(A_sparse.transpose().toDense(), A.T, atol=tol) and np.allclose(
+        A_sparse.diagonal(), [7, 0, 0], atol=tol), "CSRMatrix does not agree with known solution"
+
+
+def test_solveSparse():
+    import numpy as np
+    from numa import LinearSystem
+    tol = 1e-12
+
+    A = _poissonMatrix(12)
+    A_dense = A.toDense()
+    np.random.seed(8)
+    b = np.random.rand(144)
+    B = np.random.rand(144, 3)
+    assert np.allclose(LinearSystem.solveSparse(A, b), np.linalg.solve(A_dense, b),
+                       atol=tol), "LinearSystem.solveSparse does not agree with known solution"
+
+    factorization = LinearSystem.SparseLUFactorization(A)
+    assert np.allclose(factorization.solve(B), np.linalg.solve(A_dense, B),
+                       atol=tol), "SparseLUFactorization.solve does not agree with known solution"
+    assert np.allclose(factorization.slogdet(), np.linalg.slogdet(A_dense), atol=1e-10)
+
+    A = np.array([[0, 2, 1], [1, 1, 1], [4, 0, 3]], dtype=float)
+    b = np.array([5, 7, 13], dtype=float)
+    assert np.allclose(LinearSystem.solveSparse(A, b, ordering=None), np.linalg.solve(A, b),
+                       atol=tol), "LinearSystem.solveSparse does not agree with known solution"
+
+
+def test_reverseCuthillMcKee():
+    import numpy as np
+    from numa import LinearSystem
+
+    A = _poissonMatrix(12).toDense()
+    np.random.seed(9)
+    shuffle = np.random.permutation(144)
+    A = A[shuffle][:, shuffle]
+    q = LinearSystem.reverseCuthillMcKee(LinearSystem.CSRMatrix.fromDense(A))
+
+    def bandwidth(M):
+        rows, cols = np.nonzero(M)
+        return np.max(np.abs(rows - cols))
+
+    assert sorted(q) == list(range(144)) and bandwidth(A[q][:, q]) <= 2 * 12, \
+        "LinearSystem.reverseCuthillMcKee does not reduce the bandwidth"
+
+
+def test_solveSparse_poissonAccuracy():
+    import numpy as np
+    from numa import LinearSystem
+
+    A = _poissonMatrix(40)
+    b = np.ones(1600)
+    factorization = LinearSystem.SparseLUFactorization(A)
+    x_true = np.linalg.solve(A.toDense(), b)
+    assert np.array_equal(factorization.perm, np.arange(1600)), "SparseLUFactorization chose off-diagonal pivots"
+    assert np.allclose(factorization.solve(b), x_true, rtol=1e-12, atol=0), \
+        "SparseLUFactorization.solve does not agree with known solution"
+
+
+def test_solveSparse_singularMatrix():
+    import numpy as np
+    from numa import LinearSystem, utils
+    import pytest
+
+    A = np.array([[0, 2, 1], [1, 1, 1], [4, 0, 2]], dtype=float)
+    b = np.array([1, 1, 1], dtype=float)
+    with pytest.raises(utils.SingularityError):
+        LinearSystem.solveSparse(A, b)
+
+
+def test_conjugateGradient():
+    import numpy as np
+    from numa import LinearSystem
+    tol = 1e-8
+
+    A = _poissonMatrix(15)
+    A_dense = A.toDense()
+    np.random.seed(10)
+    b = np.random.rand(225)
+    true_solution = np.linalg.solve(A_dense, b)
+
+    x, error = LinearSystem.conjugateGradient(A, b)
+    assert error < 1e-10 and np.allclose(x, true_solution, atol=tol), \
+        "LinearSystem.conjugateGradient does not agree with known solution"
+
+    x, error, iterations = LinearSystem.conjugateGradient(
+        A_dense, b, preconditioner=LinearSystem.ilu0Preconditioner(A), giveIterations=True)
+    assert np.allclose(x, true_solution, atol=tol) and isinstance(iterations, list), \
+        "LinearSystem.conjugateGradient does not agree with known solution or the number of iterations is not given back correctly"
+
+
+def test_bicgstab_gmres():
+    import numpy as np
+    from numa import LinearSystem
+    tol = 1e-8
+
+    np.random.seed(11)
+    A = np.random.rand(100, 100) + 10 * np.identity(100)
+    b = np.random.rand(100)
+    true_solution = np.linalg.solve(A, b)
+
+    x, error = LinearSystem.bicgstab(A, b, preconditioner=LinearSystem.jacobiPreconditioner(A))
+    assert np.allclose(x, true_solution, atol=tol), "LinearSystem.bicgstab does not agree with known solution"
+
+    x, error = LinearSystem.gmres(lambda v: np.matmul(A, v), b, restart=10)
+    assert np.allclose(x, true_solution, atol=tol), "LinearSystem.gmres does not agree with known solution"
+
+    x, error = LinearSystem.gmres(LinearSystem.CSRMatrix.fromDense(A), b,
+                                  preconditioner=LinearSystem.ilu0Preconditioner(A))
+    assert np.allclose(x, true_solution, atol=tol), "LinearSystem.gmres does not agree with known solution"
+
+
+def test_krylov_maxIterations():
+    import numpy as np
+    from numa import LinearSystem, utils
+    import pytest
+
+    A = _poissonMatrix(15)
+    b = np.ones(225)
+    with pytest.raises(utils.MaximumIterationError):
+        LinearSystem.conjugateGradient(A, b, max_iterations=5)
+    with pytest.raises(utils.MaximumIterationError):
+        LinearSystem.bicgstab(A, b, max_iterations=5)
+    with pytest.raises(utils.MaximumIterationError):
+        LinearSystem.gmres(A, b, max_iterations=5, restart=3)
+
+
+def test_stationarySolvers():
+    import numpy as np
+    from numa import LinearSystem
+    tol = 1e-6
+
+    A = _poissonMatrix(12)
+    np.random.seed(12)
+    b = np.random.rand(144)
+    true_solution = np.linalg.solve(A.toDense(), b)
+
+    x, error = LinearSystem.jacobi(A, b, tol=1e-9)
+    assert np.allclose(x, true_solution, atol=tol), "LinearSystem.jacobi does not agree with known solution"
+
+    x, error, iterations = LinearSystem.gaussSeidel(A.toDense(), b, tol=1e-9, giveIterations=True)
+    x_rb, error, iterations_rb = LinearSystem.gaussSeidel(A, b, tol=1e-9, ordering="red-black", giveIterations=True)
+    assert np.allclose(x, true_solution, atol=tol) and np.allclose(x_rb, true_solution, atol=tol), \
+        "LinearSystem.gaussSeidel does not agree with known solution"
+    assert all(isinstance(i, tuple) and len(i) == 2 for i in iterations_rb), \
+        "LinearSystem.gaussSeidel does not give back the number of iterations correctly"
+
+    x, error, iterations_sor = LinearSystem.sor(A, b, tol=1e-9, ordering="red-black", giveIterations=True)
+    assert np.allclose(x, true_solution, atol=tol) and len(iterations_sor) < len(iterations_rb) / 4, \
+        "LinearSystem.sor does not agree with known solution or does not converge faster than Gauss-Seidel"
+
+
+def test_stationarySolvers_maxIterations():
+    import numpy as np
+    from numa import LinearSystem, utils
+    import pytest
+
+    A = _poissonMatrix(12)
+    b = np.ones(144)
+    with pytest.raises(utils.MaximumIterationError):
+        LinearSystem.jacobi(A, b, max_iterations=5)
+    with pytest.raises(utils.MaximumIterationError):
+        LinearSystem.sor(A, b, omega=1.5, max_iterations=5)
+
+
+def _bandStorage(A, kl, ku):
+    import numpy as np
+    n = A.shape[-1]
+    ab = np.zeros(A.shape[:-2] + (kl + ku + 1, n))
+    for i in range(n):
+        for j in range(max(0, i - kl), min(n, i + ku + 1)):
+            ab[..., ku + i - j, j] = A[..., i, j]
+    return ab
+
+
+def test_solveTridiagonal():
+    import numpy as np
+    from numa import LinearSystem
+    tol = 1e-12
+
+    np.random.seed(13)
+    A = np.triu(np.tril(np.random.rand(4, 30, 30), 1), -1) + 3 * np.identity(30)
+    B = np.random.rand(4, 30, 2)
+    X = LinearSystem.solveTridiagonal(_bandStorage(A, 1, 1), B)
+    assert X.shape == B.shape and np.allclose(X, np.linalg.solve(A, B), atol=tol), \
+        "LinearSystem.solveTridiagonal does not agree with known solution"
+
+    x = LinearSystem.solveTridiagonal(_bandStorage(A[0], 1, 1), B[0, :, 0])
+    assert np.allclose(x, np.linalg.solve(A[0], B[0, :, 0]), atol=tol), \
+        "LinearSystem.solveTridiagonal does not agree with known solution"
+
+
+def test_solveBanded():
+    import numpy as np
+    from numa import LinearSystem
+    tol = 1e-11
+
+    np.random.seed(14)
+    for kl, ku in ((1, 1), (2, 2), (3, 1), (0, 2)):
+        A = np.triu(np.tril(np.random.randn(30, 30), ku), -kl) + 2 * np.identity(30)
+        b = np.random.randn(30)
+        x = LinearSystem.solveBanded((kl, ku), _bandStorage(A, kl, ku), b)
+        assert np.allclose(x, np.linalg.solve(A, b), atol=tol), \
+            "LinearSystem.solveBanded does not agree with known solution"
+
+    A = np.triu(np.tril(np.random.randn(5, 30, 30), 2), -2)
+    B = np.random.randn(5, 30, 3)
+    X = LinearSystem.solveBanded((2, 2), _bandStorage(A, 2, 2), B)
+    assert np.allclose(X, np.linalg.solve(A, B), atol=tol), "LinearSystem.solveBanded does not agree with known solution"
+
+
+def test_solveBanded_singularMatrix():
+    import numpy as np
+    from numa import LinearSystem, utils
+    import pytest
+
+    A = np.array([[0, 2, 1], [1, 1, 1], [4, 0, 2]], dtype=float)
+    b = np.array([1, 1, 1], dtype=float)
+    with pytest.raises(utils.SingularityError):
+        LinearSystem.solveBanded((2, 2), _bandStorage(A, 2, 2), b)
+
+
+def test_cholesky():
+    import numpy as np
+    from numa import LinearSystem
+    tol = 1e-12
+
+    np.random.seed(15)
+    M = np.random.rand(50, 50)
+    A = np.matmul(M, M.T) + 50 * np.identity(50)
+    L = LinearSystem.cholesky(A)
+    assert np.allclose(np.matmul(L, L.T), A, atol=tol) and np.allclose(np.triu(L, 1), 0.), \
+        "LinearSystem.cholesky does not agree with known solution"
+
+    b = np.random.rand(50)
+    B = np.random.rand(50, 3)
+    factorization = LinearSystem.CholeskyFactorization(A)
+    assert np.allclose(LinearSystem.solveCholesky(A, b), np.linalg.solve(A, b), atol=tol), \
+        "LinearSystem.solveCholesky does not agree with known solution"
+    assert np.allclose(factorization.solve_many(B), np.linalg.solve(A, B), atol=tol), \
+        "CholeskyFactorization.solve_many does not agree with known solution"
+    assert np.allclose(factorization.slogdet(), np.linalg.slogdet(A), atol=1e-10), \
+        "CholeskyFactorization.slogdet does not agree with known solution"
+
+
+def test_cholesky_notPositiveDefinite():
+    import numpy as np
+    from numa import LinearSystem, utils
+    import pytest
+
+    A = np.array([[2, 1, 0], [1, -3, 1], [0, 1, 2]], dtype=float)
+    with pytest.raises(utils.PositiveDefiniteError):
+        LinearSystem.cholesky(A)
+
+
+def test_LDL():
+    import numpy as np
+    from numa import LinearSystem
+    tol = 1e-12
+
+    A = np.array([[2, 1, 0], [1, -3, 1], [0, 1, 2]], dtype=float)
+    L, D = LinearSystem.LDL(A, pivoting=False)
+    assert np.allclose(np.matmul(np.matmul(L, D), L.T), A, atol=tol), "LinearSystem.LDL does not agree with known solution"
+    P, L, D = LinearSystem.LDL(A)
+    assert np.allclose(np.matmul(np.matmul(L, D), L.T), np.matmul(np.matmul(P, A), P.T), atol=tol), \
+        "LinearSystem.LDL does not agree with known solution"
+
+    b = np.array([1, 2, 3], dtype=float)
+    factorization = LinearSystem.LDLFactorization(A)
+    assert np.allclose(factorization.solve(b), np.linalg.solve(A, b), atol=tol), \
+        "LDLFactorization.solve does not agree with known solution"
+    assert np.allclose(factorization.det(), np.linalg.det(A), atol=tol), \
+        "LDLFactorization.det does not agree with known solution"
+
+
+def test_LDL_indefinite():
+    import numpy as np
+    from numa import LinearSystem
+    tol = 1e-10
+
+    A = np.array([[0, 1], [1, 0]], dtype=float)
+    factorization = LinearSystem.LDLFactorization(A)
+    assert np.allclose(factorization.solve([1, 2]), [2, 1], atol=tol), \
+        "LDLFactorization.solve does not agree with known solution"
+    assert np.allclose(factorization.det(), -1, atol=tol), "LDLFactorization.det does not agree with known solution"
+
+    np.random.seed(15)
+    M = np.random.randn(200, 200)
+    A = M + M.T
+    P, L, D = LinearSystem.LDL(A)
+    assert np.allclose(np.matmul(np.matmul(L, D), L.T), np.matmul(np.matmul(P, A), P.T), atol=tol), \
+        "LinearSystem.LDL does not agree with known solution"
+    assert np.max(np.abs(L)) < 10, "Entries of L grow despite pivoting"
+
+    K = np.zeros((30, 30))                      # saddle point system with a zero block
+    K[:20, :20] = np.matmul(M[:20, :20], M[:20, :20].T) + np.identity(20)
+    K[20:, :20] = M[20:30, :20]
+    K[:20, 20:] = M[20:30, :20].T
+    b = np.random.rand(30, 2)
+    factorization = LinearSystem.LDLFactorization(K)
+    assert np.allclose(factorization.solve(b), np.linalg.solve(K, b), atol=tol), \
+        "LDLFactorization.solve does not agree with known solution"
+    assert np.allclose(factorization.slogdet(), np.linalg.slogdet(K)), \
+        "LDLFactorization.slogdet does not agree with known solution"
+
+
+def test_conditionEstimate():
+    import numpy as np
+    from numa import LinearSystem
+
+    A = np.array([[7, -1, 0], [4, 6, -3],
+                  [-2, 6, 1]], dtype=float)
+    assert np.allclose(LinearSystem.condition(A, p=1, exact=False), np.linalg.cond(A, p=1)), \
+        "LinearSystem.condition does not agree with known solution."
+
+    np.random.seed(16)
+    for n in (10, 50, 200):
+        A = np.random.rand(n, n)
+        true_value = np.linalg.cond(A, p=1)
+        estimate = LinearSystem.conditionEstimate(A)
+        assert true_value / 3 <= estimate <= true_value * (1 + 1e-10), \
+            "LinearSystem.conditionEstimate is not close to the condition number."
+
+    M = np.random.rand(50, 50)
+    A = np.matmul(M, M.T) + np.identity(50)
+    factorization = LinearSystem.CholeskyFactorization(A)
+    estimate = LinearSystem.conditionEstimate(A, factorization=factorization)
+    assert np.allclose(estimate, np.linalg.cond(A, p=1), rtol=0.5), \
+        "LinearSystem.conditionEstimate is not close to the condition number."
+
+    A = np.array([[0, 2, 1], [1, 1, 1], [4, 0, 2]], dtype=float)
+    assert LinearSystem.conditionEstimate(A) == np.inf
+
+
+def test_solve():
+    import numpy as np
+    from numa import LinearSystem
+
+    tol = 1e-10
+    np.random.seed(17)
+    n = 40
+    b = np.random.rand(n)
+    M = np.random.rand(n, n)
+    tridiagonal = np.diag(4 + np.random.rand(n)) + np.diag(np.random.rand(n - 1), 1) \
+        + np.diag(np.random.rand(n - 1), -1)
+    cases = [(np.diag(1 + np.random.rand(n)), "diagonal"),
+             (np.tril(M) + n * np.identity(n), "lower"),
+             (np.triu(M) + n * np.identity(n), "upper"),
+             (tridiagonal, "banded"),
+             (np.matmul(M, M.T) + np.identity(n), "cholesky"),
+             (M + M.T - n * np.identity(n), "lu"),
+             (M, "lu")]
+    for A, method in cases:
+        x, info = LinearSystem.solve(A, b, giveInfo=True)
+        assert info["method"] == method, f"LinearSystem.solve chose {info['method']} instead of {method}"
+        assert np.allclose(np.matmul(A, x), b, atol=tol), "LinearSystem.solve does not agree with known solution"
+
+    B = np.random.rand(n, 3)
+    assert np.allclose(np.matmul(tridiagonal, LinearSystem.solve(tridiagonal, B)), B, atol=tol), \
+        "LinearSystem.solve does not agree with known solution"
+    x, info = LinearSystem.solve(tridiagonal, b, method="gauss", giveInfo=True)
+    assert info["method"] == "gauss" and np.allclose(np.matmul(tridiagonal, x), b, atol=tol), \
+        "LinearSystem.solve does not agree with known solution"
+
+    A = _poissonMatrix(10)
+    x, info = LinearSystem.solve(A, np.ones(100), giveInfo=True)
+    assert info["method"] == "sparse" and np.allclose(A @ x, np.ones(100), atol=tol), \
+        "LinearSystem.solve does not agree with known solution"
+
+
+def test_outOfCoreLU(tmp_path):
+    import numpy as np
+    from numa import LinearSystem, utils
+    import pytest
+
+    tol = 1e-12
+    np.random.seed(18)
+    n = 61
+    A_original = np.random.rand(n, n)
+    b = np.random.rand(n)
+    cases = (("C", np.float64, tol, 1e-10), ("F", np.float64, tol, 1e-10), ("C", np.float32, 1e-5, 1e-3))
+    for order, dtype, atol, solve_tol in cases:
+        A = np.memmap(str(tmp_path / f"A_{order}_{np.dtype(dtype).name}.dat"), dtype=dtype, mode="w+",
+                      shape=(n, n), order=order)
+        A[:] = A_original
+        perm = LinearSystem.outOfCoreLU(A, memory_limit=3 * A.itemsize * n * 7)
+        L, U = np.tril(A, -1) + np.identity(n), np.triu(A)
+        assert np.allclose(np.matmul(L, U), A_original[perm], atol=atol), \
+            "LinearSystem.outOfCoreLU does not agree with known solution"
+        x = LinearSystem.solveOutOfCore(A, perm, b, memory_limit=A.itemsize * n * 5)
+        assert np.allclose(x, np.linalg.solve(A_original, b), atol=solve_tol), \
+            "LinearSystem.solveOutOfCore does not agree with known solution"
+
+    A = np.array([[0, 2, 1], [1, 1, 1], [4, 0, 2]], dtype=float)
+    with pytest.raises(utils.SingularityError):
+        LinearSystem.outOfCoreLU(A, memory_limit=24)
+
+
+def test_parallel():
+    import numpy as np
+    from numa import LinearSystem, utils
+
+    np.random.seed(19)
+    A = np.random.rand(300, 300)
+    B = np.random.rand(300, 600)
+    A_batch, b_batch = np.random.rand(200, 4, 4), np.random.rand(200, 4)
+
+    def run():
+        factorization = LinearSystem.LUFactorization(A, block_size=32)
+        return (factorization.LU, factorization.solve_many(B), utils.inverse(A),
+                LinearSystem.solveBatched(A_batch, b_batch)[0])
+
+    LinearSystem.setNumThreads(1)
+    serial = run()
+    LinearSystem.setNumThreads(4)
+    try:
+        assert LinearSystem.getNumThreads() == 4
+        parallel = run()
+    finally:
+        LinearSystem.setNumThreads(1)
+    for expected, result in zip(serial, parallel):
+        assert np.array_equal(expected, result), "Parallel result differs from the serial result"
+    assert np.allclose(np.matmul(A, parallel[1]), B), "LUFactorization.solve_many does not agree with known solution"
+    assert np.allclose(np.matmul(A, parallel[2]), np.identity(300)), "utils.inverse does not agree with known solution"
+
+
+def test_parallel_serialSpeed():
+    import time
+    import numpy as np
+    from numa import LinearSystem
+    from numa.LinearSystem._batched import _eliminate
+    from numa.LinearSystem._triangular import solveLower, solveUpper
+
+    def best_time(function, repeats=3):
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            function()
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    def untiled():
+        X = B[factorization.perm]
+        X = solveLower(factorization.LU, X, unit_diagonal=True, overwrite_b=True)
+        solveUpper(factorization.LU, X, overwrite_b=True)
+
+    np.random.seed(19)
+    A, B = np.random.rand(400, 400), np.random.rand(400, 2048)
+    A_batch, b_batch = np.random.rand(20000, 6, 6), np.random.rand(20000, 6, 1)
+    LinearSystem.setNumThreads(1)
+    factorization = LinearSystem.LUFactorization(A)
+    assert best_time(lambda: factorization.solve_many(B)) < 1.5 * best_time(untiled), \
+        "Serial solve with column tiles is slower than without them"
+    assert (best_time(lambda: LinearSystem.solveBatched(A_batch, b_batch)) <
+            1.5 * best_time(lambda: _eliminate(A_batch.copy(), b_batch.copy(), 1e-15, np.zeros(20000, dtype=bool)))), \
+        "Serial batched solve with chunks is slower than without them"
+
+
+def test_FactorizationCache():
+    import numpy as np
+    from numa import LinearSystem
+
+    np.random.seed(20)
+    A, C = np.random.rand(20, 20), np.random.rand(20, 20)
+    b = np.random.rand(20)
+    cache = LinearSystem.FactorizationCache(max_bytes=20 * 20 * 8 + 20 * 8)
+    for _ in range(3):
+        x = LinearSystem.solveLU(A, b, cache=cache)
+        assert np.allclose(np.matmul(A, x), b), "LinearSystem.solveLU does not agree with known solution"
+    assert (cache.hits, cache.misses, len(cache)) == (2, 1, 1), "FactorizationCache did not reuse the factorization"
+
+    assert np.allclose(np.matmul(C, cache.solve(C, b, key="C")), b), \
+        "FactorizationCache.solve does not agree with known solution"
+    assert len(cache) == 1 and "C" in cache, "FactorizationCache did not evict the least recently used entry"
+    cache.solve(A.copy(), b)
+    assert (cache.hits, cache.misses) == (2, 3), "FactorizationCache did not count the lookups"
+
+    cache = LinearSystem.FactorizationCache(factorization=LinearSystem.CholeskyFactorization)
+    S = np.matmul(A, A.T) + np.identity(20)
+    cache.get(S)
+    assert cache.get(S) is cache.get(S.copy()) and cache.hits == 2, \
+        "FactorizationCache does not identify matrices by their content"
+
+
+def test_lowRankUpdates():
+    import numpy as np
+    from numa import LinearSystem
+
+    tol = 1e-10
+    np.random.seed(21)
+    n = 30
+    A = np.random.rand(n, n) + n * np.identity(n)
+    U, V = np.random.rand(n, 3), np.random.rand(n, 3)
+    b = np.random.rand(n)
+    x = LinearSystem.solveWoodbury(LinearSystem.LUFactorization(A), U, V, b)
+    assert np.allclose(x, np.linalg.solve(A + np.matmul(U, V.T), b), atol=tol), \
+        "LinearSystem.solveWoodbury does not agree with known solution"
+
+    factorization = LinearSystem.LUFactorization(A, keep_a=True)
+    for k in range(3):
+        factorization.update(U[:, k], V[:, k])
+    assert factorization.refactorizations == 0, "LUFactorization.update decomposed A again"
+    assert np.allclose(factorization.solve(b), np.linalg.solve(A + np.matmul(U, V.T), b), atol=tol), \
+        "LUFactorization.update does not agree with known solution"
+
+    factorization = LinearSystem.LUFactorization(np.array([[1., 1.], [0., 1.]]), keep_a=True)
+    factorization.update([-1., 1.], [1., 0.])
+    assert factorization.refactorizations == 1, "LUFactorization.update did not detect the zero pivot"
+    assert np.allclose(factorization.solve([1., 2.]), [1., 1.], atol=tol), \
+        "LUFactorization.update does not agree with known solution"
+
+    S = np.matmul(A, A.T)
+    factorization = LinearSystem.CholeskyFactorization(S, keep_a=True)
+    factorization.update(U[:, 0])
+    factorization.downdate(U[:, 1])
+    expected = S + np.outer(U[:, 0], U[:, 0]) - np.outer(U[:, 1], U[:, 1])
+    assert np.allclose(np.matmul(factorization.L, factorization.L.T), expected, atol=1e-8), \
+        "CholeskyFactorization.update does not agree with known solution"
+
+
+def test_Gauss_inPlace():
+    import numpy as np
+    from numa import LinearSystem
+
+    tol = 1e-10
+    np.random.seed(22)
+    A_original, B_original = np.random.rand(50, 50), np.random.rand(50, 3)
+    X_true = np.linalg.solve(A_original, B_original)
+
+    out = np.empty((50, 3))
+    X = LinearSystem.solveGauss(A_original, B_original, out=out)
+    assert X is out and np.allclose(out, X_true, atol=tol), "LinearSystem.solveGauss does not agree with known solution"
+
+    A, B = A_original.copy(), B_original.copy()
+    X = LinearSystem.solveGauss(A, B, overwrite_a=True, overwrite_b=True)
+    assert X is B and np.allclose(B, X_true, atol=tol), "LinearSystem.solveGauss does not agree with known solution"
+    assert not np.allclose(A, A_original), "LinearSystem.solveGauss did not overwrite A"
+
+    A, b = A_original.copy(), B_original[:, 0].copy()
+    x = LinearSystem.solveGauss(A, b, overwrite_a=True)
+    assert np.allclose(x, X_true[:, 0], atol=tol) and np.array_equal(b, B_original[:, 0]), \
+        "LinearSystem.solveGauss does not agree with known solution"
+
+
+def test_solve_memory():
+    import tracemalloc
+    import numpy as np
+    from numa import LinearSystem
+
+    np.random.seed(8)
+    A, b = np.random.rand(1000, 1000), np.random.rand(1000)
+    for solver in (LinearSystem.solveGauss, LinearSystem.solveLU):
+        tracemalloc.start()
+        try:
+            solver(A, b)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        assert peak < 1.5 * A.nbytes, f"{solver.__name__} needs more than one working copy of A"
+
+
+def test_Gauss_pivoting():
+    import numpy as np
+    from numa import LinearSystem
+
+    tol = 1e-10
+    n = 20
+    W = np.identity(n) - np.tril(np.ones((n, n)), -1)
+    W[:, -1] = 1.
+    b = np.ones(n)
+    _, info = LinearSystem.solveGauss(W, b, pivoting="partial", giveInfo=True)
+    assert info["growth_factor"] == 2. ** (n - 1), "LinearSystem.solveGauss did not record the growth factor"
+    for pivoting in ("rook", "complete"):
+        x, info = LinearSystem.solveGauss(W, b, pivoting=pivoting, giveInfo=True)
+        assert info["growth_factor"] <= 2., f"Growth factor of {pivoting} pivoting is too large"
+        assert np.allclose(np.matmul(W, x), b, atol=tol), "LinearSystem.solveGauss does not agree with known solution"
+
+    np.random.seed(23)
+    A = np.random.rand(30, 30) * np.logspace(0, 8, 30)[:, None]
+    B = np.random.rand(30, 2)
+    for pivoting in ("partial", "scaled", "rook", "complete"):
+        X = LinearSystem.solveGauss(A, B, pivoting=pivoting)
+        assert np.allclose(X, np.linalg.solve(A, B), atol=tol), "LinearSystem.solveGauss does not agree with known solution"
+
+    A = np.array([[1e10, 1e30], [1., 1.]])                  # exact solution 1 / (1 - 1e-20) for both
+    b = np.array([1e30, 2.])
+    errors = {pivoting: np.max(np.abs(LinearSystem.solveGauss(A, b, pivoting=pivoting) - 1.))
+              for pivoting in ("partial", "scaled")}
+    assert errors["partial"] > 0.5, "Partial pivoting was expected to lose the first component"
+    assert errors["scaled"] < tol, "Scaled partial pivoting does not agree with known solution"
+
+
+def test_QR():
+    import numpy as np
+    from numa import LinearSystem
+
+    tol = 1e-12
+    np.random.seed(24)
+    A = np.random.rand(100, 20)
+    for block_size in (None, 6):
+        Q, R = LinearSystem.QR(A, block_size=block_size)
+        assert np.allclose(np.matmul(Q, R), A, atol=tol), "LinearSystem.QR does not agree with known solution"
+        assert np.allclose(np.matmul(Q.T, Q), np.identity(20), atol=tol) and np.allclose(R, np.triu(R)), \
+            "LinearSystem.QR does not agree with known solution"
+
+
+def test_leastSquares():
+    import numpy as np
+    from numa import LinearSystem, utils
+    import pytest
+
+    tol = 1e-10
+    np.random.seed(24)
+    A, B = np.random.rand(200, 10), np.random.rand(200, 2)
+    X_true, residual, _, _ = np.linalg.lstsq(A, B, rcond=None)
+    assert np.allclose(LinearSystem.solveLeastSquares(A, B, block_size=4), X_true, atol=tol), \
+        "LinearSystem.solveLeastSquares does not agree with known solution"
+    assert np.allclose(LinearSystem.solveLeastSquares(A, B[:, 0]), X_true[:, 0], atol=tol), \
+        "LinearSystem.solveLeastSquares does not agree with known solution"
+
+    solver = LinearSystem.StreamingLeastSquares(10)
+    solver.extend((A[i:i+32], B[i:i+32]) for i in range(0, 200, 32))
+    assert solver.rows == 200 and np.allclose(solver.solve(), X_true, atol=tol), \
+        "LinearSystem.StreamingLeastSquares does not agree with known solution"
+    assert np.allclose(solver.residual, residual), "StreamingLeastSquares.residual does not agree with known solution"
+
+    A[:, 3] = A[:, 1]
+    with pytest.raises(utils.SingularityError):
+        LinearSystem.solveLeastSquares(A, B)
+
+
+def test_eigenvalues():
+    import numpy as np
+    from numa import LinearSystem
+
+    tol = 1e-8
+    np.random.seed(25)
+    n = 100
+    Q, _ = np.linalg.qr(np.random.rand(n, n))
+    S = np.matmul(Q * np.linspace(1, 10, n), Q.T)
+
+    eigenvalue, x = LinearSystem.powerIteration(S)
+    assert np.allclose(eigenvalue, 10, atol=tol) and np.allclose(np.matmul(S, x), eigenvalue * x, atol=1e-6), \
+        "LinearSystem.powerIteration does not agree with known solution"
+    eigenvalue, x = LinearSystem.inverseIteration(S, shift=4.98)
+    assert np.allclose(eigenvalue, 1 + 9 * 44 / 99, atol=tol), \
+        "LinearSystem.inverseIteration does not agree with known solution"
+
+    for A in (S, LinearSystem.CSRMatrix.fromDense(S), lambda v: np.matmul(S, v)):
+        smallest, largest = LinearSystem.extremeEigenvalues(A, n=n)
+        assert np.allclose([smallest, largest], [1, 10], atol=tol), \
+            "LinearSystem.extremeEigenvalues does not agree with known solution"
+
+    A = np.random.rand(n, n)
+    eigenvalues = np.linalg.eigvals(A)
+    eigenvalues = eigenvalues[np.argsort(np.abs(eigenvalues))]
+    assert np.allclose(LinearSystem.extremeEigenvalues(A, symmetric=False), eigenvalues[[0, -1]], atol=tol), \
+        "LinearSystem.extremeEigenvalues does not agree with known solution"
+
+    singular_values = np.linalg.svd(A, compute_uv=False)
+    assert np.allclose(LinearSystem.singularValues(A), singular_values[[-1, 0]], atol=tol), \
+        "LinearSystem.singularValues does not agree with known solution"
+    estimate = LinearSystem.condition(A, p=2, exact=False)
+    assert np.allclose(estimate, np.linalg.cond(A, p=2), rtol=1e-3), \
+        "LinearSystem.condition does not agree with known solution"
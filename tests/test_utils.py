@@ -44,3 +44,75 @@ def test_inverse():
 
     assert np.allclose(utils.inverse(
         A), inverseA, atol=tol), "utils.inverse does not agree with known solution."
+
+
+def test_inverse_out():
+    import numpy as np
+    from numa import utils
+    tol = 1e-12
+
+    np.random.seed(2)
+    A = np.random.rand(40, 40)
+    out = np.empty((40, 40))
+    inverseA = utils.inverse(A, out=out)
+    assert inverseA is out and np.allclose(
+        np.matmul(A, out), np.identity(40), atol=tol), "utils.inverse does not agree with known solution."
+
+
+def test_isSingular_scaledMatrices():
+    import numpy as np
+    from numa import utils
+
+    A = 1e-5 * np.identity(100)
+    assert np.allclose(np.linalg.det(A), 0.) and not utils.isSingular(A)
+
+    A = 1e150 * np.array([[0, 2, 1], [1, 1, 1], [4, 0, 2]], dtype=float)
+    assert utils.isSingular(A)
+
+    A = np.diag([1., 1e-20])
+    assert not utils.isSingular(A) and utils.rank(A) == 1
+    assert not utils.isSingular(np.array([[1e10, 1e30], [1., 1.]]))
+    assert utils.isSingular(np.arange(1., 10.).reshape(3, 3))
+
+
+def test_rank():
+    import numpy as np
+    from numa import utils
+
+    A = np.array([[0, 2, 1], [1, 1, 1], [4, 0, 2]], dtype=float)
+    assert utils.rank(A) == 2
+    assert utils.rank(np.column_stack((A, A))) == 2
+    assert utils.rank(np.identity(4)) == 4
+
+
+def test_slogdet():
+    import numpy as np
+    from numa import utils, LinearSystem
+    tol = 1e-10
+
+    np.random.seed(7)
+    A = np.random.rand(300, 300) + 5 * np.identity(300)
+    sign, logdet = utils.slogdet(A)
+    true_sign, true_logdet = np.linalg.slogdet(A)
+    assert sign == true_sign and np.allclose(
+        logdet, true_logdet, atol=tol), "utils.slogdet does not agree with known solution."
+
+    factorization = LinearSystem.LUFactorization(A)
+    assert utils.slogdet(A, factorization=factorization) == (sign, logdet)
+
+    A = np.array([[0, 2, 1], [1, 1, 1], [4, 0, 2]], dtype=float)
+    assert utils.slogdet(A) == (0., -np.inf)
+
+
+def test_isPositiveDefinite():
+    import numpy as np
+    from numa import utils
+
+    A = np.array([[2, -1, 0], [-1, 2, -1], [0, -1, 2]], dtype=float)
+    assert utils.isPositiveDefinite(A)
+
+    A = np.array([[2, 1, 0], [1, -3, 1], [0, 1, 2]], dtype=float)
+    assert not utils.isPositiveDefinite(A)
+
+    A = np.array([[2, -1, 0], [0, 2, -1], [0, -1, 2]], dtype=float)
+    assert not utils.isPositiveDefinite(A)